@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# ----- Spaltenweise Ausgabe (optional) ----- #
+# Zusätzlich zur CSV können die Zeilen als Spalten mit festen Typen gespeichert werden:
+#   Flaeche, Masse                          -> float64 (fehlend = NaN)
+#   Typ, Stockwerk, Material, KG, ...      -> Wörterbuch-kodiert (int32-Codes + Werteliste)
+#   Name, GUID                              -> Text
+# Masse (kg) ist hier gefüllt, in der CSV bleibt sie für den eLCA-Import leer (siehe MaterialMass.py).
+# Format nach Dateiendung:
+#   .npz              NumPy; je kodierter Spalte <Spalte>_codes und <Spalte>_values
+#   .parquet/.arrow   pyarrow; kodierte Spalten als DictionaryArray
+# numpy bzw. pyarrow werden erst beim Schreiben geladen und sind nur für diese Ausgabe nötig.
+
+import os
+from array import array
+
+FLOAT_COLUMNS = ('Flaeche', 'Masse')
+DICTIONARY_COLUMNS = ('KostengruppeNr', 'Typ', 'Stockwerk', 'Material', 'PredefinedType', 'Unit', 'KostengruppeName')
+
+FORMATS = ('.npz', '.parquet', '.arrow')
+
+
+def check_format(filename):
+    # vor dem Laden des Modells prüfen, nicht erst nach der Extraktion
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError('Unbekanntes Format %s (%s)' % (extension, ', '.join(FORMATS)))
+    return extension
+
+
+def to_float(value):
+    if value is None or value == '':
+        return float('nan')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class ColumnBuilder:
+    # sammelt die Zeilen spaltenweise, ohne die Zeilen selbst zu halten
+    def __init__(self, header):
+        self.header = list(header)
+        self.columns = []
+        for name in self.header:
+            if name in FLOAT_COLUMNS:
+                self.columns.append(array('d'))
+            elif name in DICTIONARY_COLUMNS:
+                self.columns.append((array('i'), {}))
+            else:
+                self.columns.append([])
+
+    def append(self, row):
+        for name, column, value in zip(self.header, self.columns, row):
+            if name in FLOAT_COLUMNS:
+                column.append(to_float(value))
+            elif name in DICTIONARY_COLUMNS:
+                codes, dictionary = column
+                key = '' if value is None else str(value)
+                code = dictionary.get(key)
+                if code is None:
+                    code = dictionary[key] = len(dictionary)
+                codes.append(code)
+            else:
+                column.append('' if value is None else str(value))
+
+    def write(self, filename):
+        extension = check_format(filename)
+        if extension == '.npz':
+            self.write_npz(filename)
+        else:
+            self.write_arrow(filename, extension)
+
+    def write_npz(self, filename):
+        import numpy
+
+        arrays = {}
+        for name, column in zip(self.header, self.columns):
+            if name in FLOAT_COLUMNS:
+                arrays[name] = numpy.frombuffer(column, dtype=numpy.float64)
+            elif name in DICTIONARY_COLUMNS:
+                codes, dictionary = column
+                arrays[name + '_codes'] = numpy.frombuffer(codes, dtype=numpy.int32)
+                arrays[name + '_values'] = numpy.array(list(dictionary), dtype=str)
+            else:
+                arrays[name] = numpy.array(column, dtype=str)
+        # numpy hängt sonst .npz an
+        with open(filename, 'wb') as file:
+            numpy.savez_compressed(file, **arrays)
+
+    def write_arrow(self, filename, extension):
+        import pyarrow
+
+        columns = []
+        for name, column in zip(self.header, self.columns):
+            if name in FLOAT_COLUMNS:
+                # NaN -> null
+                columns.append(pyarrow.array(column, type=pyarrow.float64(), from_pandas=True))
+            elif name in DICTIONARY_COLUMNS:
+                codes, dictionary = column
+                columns.append(pyarrow.DictionaryArray.from_arrays(pyarrow.array(codes, type=pyarrow.int32()),
+                                                                   pyarrow.array(list(dictionary), type=pyarrow.string())))
+            else:
+                columns.append(pyarrow.array(column, type=pyarrow.string()))
+        table = pyarrow.Table.from_arrays(columns, names=self.header)
+
+        if extension == '.parquet':
+            import pyarrow.parquet
+            pyarrow.parquet.write_table(table, filename)
+        else:
+            with pyarrow.OSFile(filename, 'wb') as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# ----- Fehlerbericht ----- #
+# Fehler in den Stufen von getInfos werden nicht mehr einzeln ausgegeben (bei fehlerhaften Exporten
+# zehntausende Zeilen, die PHP per exec() puffert), sondern je Stufe und IFC-Klasse gezählt:
+#   (Stufe, IFC-Klasse) -> [Anzahl, erste Fehlermeldung, einige GUIDs]
+# Der Bericht landet als JSON neben der CSV (<csv>-errors.json).
+
+import json
+
+MAX_SAMPLES = 5
+
+_errors = {}
+
+
+def reset_errors():
+    _errors.clear()
+
+
+def record_error(stage, ifc_class, guid, error):
+    entry = _errors.get((stage, ifc_class))
+    if entry is None:
+        entry = _errors[(stage, ifc_class)] = [0, '%s: %s' % (error.__class__.__name__, error), []]
+    entry[0] += 1
+    if len(entry[2]) < MAX_SAMPLES:
+        entry[2].append(guid)
+
+
+def take_errors():
+    # Fehler eines Worker-Prozesses (Liste statt dict, Schlüssel bleiben Tupel)
+    errors = list(_errors.items())
+    _errors.clear()
+    return errors
+
+
+def merge_errors(errors):
+    for key, (count, message, samples) in errors:
+        entry = _errors.get(key)
+        if entry is None:
+            _errors[key] = [count, message, list(samples)]
+            continue
+        entry[0] += count
+        entry[2].extend(samples[:MAX_SAMPLES - len(entry[2])])
+
+
+def error_count():
+    return sum(entry[0] for entry in _errors.values())
+
+
+def error_report(**summary):
+    report = dict(summary)
+    report['errors'] = error_count()
+    report['stages'] = [{'stage': stage, 'class': ifc_class, 'count': count, 'error': message, 'samples': samples}
+                        for (stage, ifc_class), (count, message, samples)
+                        in sorted(_errors.items(), key=lambda item: -item[1][0])]
+    return report
+
+
+def write_errors(filename, report):
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=1, ensure_ascii=False)
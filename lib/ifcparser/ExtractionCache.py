@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# ----- Ergebnis-Cache ----- #
+# Das gleiche Modell wird oft mehrfach hochgeladen (Projektdaten korrigieren, erneuter Versuch).
+# Die fertige CSV (mit Fehlerbericht) wird daher unter einem Schlüssel aus
+#   SHA-256 der IFC-Datei + Parser-Version (Quelltext des Parsers und der KG-Regeln/Namen) + Optionen
+# abgelegt und beim nächsten Mal nur kopiert. Der Cache ist in der Größe begrenzt, entfernt wird
+# die am längsten nicht genutzte Datei (mtime wird bei jedem Treffer aktualisiert).
+
+import os
+import csv
+import glob
+import shutil
+import hashlib
+import tempfile
+
+PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Standard: <baseDir>/tmp/ifc-data/cache, überschreibbar per IFC2LCA_CACHE_DIR ("" = kein Cache)
+DEFAULT_CACHE_DIR = os.environ.get('IFC2LCA_CACHE_DIR', os.path.join(PARSER_DIR, '..', '..', 'tmp', 'ifc-data', 'cache'))
+CACHE_MAX_BYTES = int(os.environ.get('IFC2LCA_CACHE_MAX_MB', 512)) * 1024 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+
+_parser_version = None
+
+
+def file_digest(filename, digest=None):
+    digest = digest or hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest
+
+
+def parser_version():
+    # jede Änderung am Parser oder an den KG-Regeln/-Namen ergibt eine neue Version
+    global _parser_version
+    if _parser_version is None:
+        from KG import KG_NAMES_FILE
+
+        digest = hashlib.sha256()
+        for filename in sorted(glob.glob(os.path.join(PARSER_DIR, '*.py'))) + [KG_NAMES_FILE]:
+            digest.update(os.path.basename(filename).encode('utf-8'))
+            file_digest(filename, digest)
+        _parser_version = digest.hexdigest()[:16]
+    return _parser_version
+
+
+def cache_key(ifc_filename, *options):
+    digest = file_digest(ifc_filename)
+    digest.update(parser_version().encode('ascii'))
+    for option in options:
+        digest.update(('|%s' % (option,)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cached_filename(cache_dir, key, suffix='.csv'):
+    return os.path.join(cache_dir, key + suffix)
+
+
+def lookup(cache_dir, key, csv_filename, sidecars=None):
+    # Anzahl Elemente bei Treffer, sonst None; sidecars: {Endung: Zieldatei} für Begleitdateien
+    filename = cached_filename(cache_dir, key)
+    try:
+        shutil.copyfile(filename, csv_filename)
+        os.utime(filename)
+    except OSError:
+        return None
+    for suffix, target_filename in (sidecars or {}).items():
+        try:
+            shutil.copyfile(cached_filename(cache_dir, key, suffix), target_filename)
+        except OSError:
+            pass
+
+    with open(csv_filename, encoding='utf-8', newline='') as file:
+        return sum(1 for row in csv.reader(file, delimiter=';')) - 1
+
+
+def store_file(cache_dir, filename, cached):
+    # erst vollständig schreiben, dann umbenennen -> parallele Leser sehen nie eine halbe Datei
+    handle, tmp_filename = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    os.close(handle)
+    try:
+        shutil.copyfile(filename, tmp_filename)
+        os.replace(tmp_filename, cached)
+    finally:
+        if os.path.exists(tmp_filename):
+            os.unlink(tmp_filename)
+
+
+def store(cache_dir, key, csv_filename, sidecars=None):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Begleitdateien zuerst: ein Treffer setzt die CSV voraus
+    for suffix, filename in (sidecars or {}).items():
+        if os.path.exists(filename):
+            store_file(cache_dir, filename, cached_filename(cache_dir, key, suffix))
+    store_file(cache_dir, csv_filename, cached_filename(cache_dir, key))
+    evict(cache_dir)
+
+
+def evict(cache_dir, max_bytes=CACHE_MAX_BYTES):
+    # Einträge = alle Dateien eines Schlüssels, zuletzt genutzt = mtime der CSV
+    entries = {}
+    for filename in glob.glob(os.path.join(cache_dir, '*')):
+        if filename.endswith('.tmp'):
+            continue
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            continue
+        key, _, suffix = os.path.basename(filename).partition('.')
+        entry = entries.setdefault(key, [0, 0, []])
+        if suffix == 'csv':
+            entry[0] = stat.st_mtime
+        entry[1] += stat.st_size
+        entry[2].append(filename)
+
+    total = sum(size for mtime, size, filenames in entries.values())
+    for mtime, size, filenames in sorted(entries.values()):
+        if total <= max_bytes:
+            break
+        for filename in filenames:
+            try:
+                os.unlink(filename)
+            except OSError:
+                pass
+        total -= size
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# ----- Mengen aus der Geometrie (optional) ----- #
+# Fehlen Qto_*/BaseQuantities, bleiben Fläche und Volumen leer und müssen in eLCA von Hand nachgetragen
+# werden. Mit --geometry-quantities werden nur für diese Elemente die Körper trianguliert
+# (ifcopenshell.geom.iterator, mehrere Threads) und je Element mit NumPy ausgewertet:
+#   Volumen      Summe der vorzeichenbehafteten Tetraeder (Schwerpunkt, Dreieck)
+#   Seitenfläche Dreiecke quer zur Hauptrichtung der Flächennormalen, halbiert = eine Seite
+#                (Wand: Ansichtsfläche abzüglich Öffnungen, Decke/Dach: Grundfläche)
+#   Oberfläche   Summe aller Dreiecke (nur Stützen; Bekleidungen melden GrossSurfaceArea als eine Seite)
+# ifcopenshell liefert die Geometrie in Metern -> Flächen in m², Volumen in m³.
+# Gleiche Körper (IfcMappedItem: z.B. 10.000 gleiche Fenster) teilen sich in ifcopenshell eine Geometrie-Id.
+# Ausgewertet wird daher in lokalen Koordinaten und nur einmal je Geometrie; die Platzierung skaliert das
+# Ergebnis über ihre Determinante (Volumen * |det|, Flächen * |det|^(2/3)). Nur bei nicht gleichmäßiger
+# Skalierung wird der Körper für das einzelne Element transformiert ausgewertet.
+# Nur mit dem vollständig geladenen Modell möglich (nicht --selective-load / --lazy-load).
+
+import multiprocessing
+from Instrumentation import record_cache
+
+# Mengenangabe -> Maß aus der Geometrie
+GEOMETRY_MEASURES = {'NetSideArea': 'side',
+                     'GrossArea': 'side',
+                     'NetArea': 'side',
+                     'GrossSurfaceArea': 'surface',
+                     'GrossVolume': 'volume',
+                     'Volume': 'volume'}
+
+# abweichendes Maß je (Klasse, Mengenangabe): GrossSurfaceArea der Bekleidung ist die belegte Fläche,
+# nicht die Oberfläche des Körpers (sonst etwa doppelt so groß)
+CLASS_MEASURES = {('IfcCovering', 'GrossSurfaceArea'): 'side'}
+
+# |cos| zwischen Dreiecksnormale und Hauptrichtung, ab dem ein Dreieck zur Seitenfläche zählt
+SIDE_ALIGNMENT = 0.9
+
+# Entity-Id -> {'side': ..., 'surface': ..., 'volume': ...}
+_quantities = {}
+
+
+def reset_geometry_index():
+    _quantities.clear()
+
+
+def mesh_quantities(vertices, faces):
+    # vertices: (n, 3), faces: flache Indexliste der Dreiecke
+    import numpy
+
+    # um den Schwerpunkt verschieben: Koordinaten weit vom Ursprung kosten sonst Genauigkeit
+    vertices = vertices - vertices.mean(axis=0)
+    triangles = vertices[numpy.asarray(faces, dtype=numpy.int64).reshape(-1, 3)]
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+
+    # Kreuzprodukt = Normale mit doppelter Dreiecksfläche als Länge
+    cross = numpy.cross(b - a, c - a)
+    doubled = numpy.sqrt(numpy.einsum('ij,ij->i', cross, cross))
+    surface = doubled.sum() / 2.0
+    volume = abs(numpy.einsum('ij,ij->', a, numpy.cross(b, c))) / 6.0
+
+    # Hauptrichtung: Eigenvektor zum größten Eigenwert von Σ Fläche * n nᵀ
+    used = doubled > 0
+    normals = cross[used] / doubled[used, None]
+    tensor = numpy.einsum('i,ij,ik->jk', doubled[used], normals, normals)
+    direction = numpy.linalg.eigh(tensor)[1][:, -1]
+    side = doubled[used][numpy.abs(normals @ direction) > SIDE_ALIGNMENT].sum() / 4.0
+
+    return {'side': float(side), 'surface': float(surface), 'volume': float(volume)}
+
+
+def geometry_quantities(geometry, linear=None):
+    # None für Körper ohne Dreiecke; linear: Körper vorher transformieren
+    import numpy
+
+    faces = geometry.faces
+    if not len(faces):
+        return None
+    vertices = numpy.asarray(geometry.verts, dtype=numpy.float64).reshape(-1, 3)
+    if linear is not None:
+        vertices = vertices @ linear.T
+    return mesh_quantities(vertices, faces)
+
+
+def linear_part(matrix):
+    # Platzierung spaltenweise: 4x3 (ältere ifcopenshell-Versionen) oder 4x4
+    import numpy
+
+    matrix = numpy.asarray(matrix, dtype=numpy.float64)
+    return matrix.reshape(4, len(matrix) // 4).T[:3, :3]
+
+
+def similarity_scale(linear):
+    # Längenfaktor bei Drehung/Spiegelung + gleichmäßiger Skalierung, sonst None
+    import numpy
+
+    scale = abs(numpy.linalg.det(linear)) ** (1.0 / 3.0)
+    if scale == 0 or not numpy.allclose(linear.T @ linear, numpy.eye(3) * scale ** 2, rtol=1e-6, atol=1e-9):
+        return None
+    return scale
+
+
+def scaled_quantities(quantities, scale):
+    if scale == 1.0:
+        return quantities
+    return {'side': quantities['side'] * scale ** 2, 'surface': quantities['surface'] * scale ** 2,
+            'volume': quantities['volume'] * scale ** 3}
+
+
+def build_geometry_index(model, elements, threads=None):
+    # elements: nur die Elemente ohne Mengenangaben
+    import ifcopenshell.geom
+
+    elements = list(elements)
+    if not elements:
+        return
+    settings = ifcopenshell.geom.settings()
+    iterator = ifcopenshell.geom.iterator(settings, model, threads or multiprocessing.cpu_count(), include=elements)
+    if not iterator.initialize():
+        return
+
+    # Geometrie-Id -> Mengen in lokalen Koordinaten, nur für diesen Lauf
+    meshes = {}
+    while True:
+        shape = iterator.get()
+        geometry = shape.geometry
+        linear = linear_part(shape.transformation.matrix)
+        scale = similarity_scale(linear)
+        if scale is None:
+            quantities, scale = geometry_quantities(geometry, linear), 1.0
+        else:
+            # Dreiecke erst lesen, wenn die Geometrie-Id noch nicht ausgewertet ist
+            record_cache('mesh', geometry.id in meshes)
+            if geometry.id not in meshes:
+                meshes[geometry.id] = geometry_quantities(geometry)
+            quantities = meshes[geometry.id]
+        if quantities is not None:
+            _quantities[shape.id] = scaled_quantities(quantities, scale)
+        if not iterator.next():
+            break
+
+
+def geometry_quantity(element, quantity_name):
+    # None, wenn die Mengenangabe kein Geometriemaß hat oder das Element nicht trianguliert wurde
+    measure = CLASS_MEASURES.get((element.is_a(), quantity_name)) or GEOMETRY_MEASURES.get(quantity_name)
+    if measure is None or not _quantities:
+        return None
+    quantities = _quantities.get(element.id())
+    record_cache('geometry', quantities is not None)
+    if quantities is None:
+        return None
+    return quantities[measure]
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Langlebiger Parser-Prozess für IFC2LCA_elca.py
+#
+# Hält ifcopenshell und KG.py geladen und verarbeitet Aufträge als JSON-Zeilen
+#   {"ifc": "/pfad/model.ifc", "csv": "/pfad/ifc-data.csv"}   optional: "workers": 4, "flush_interval": 500,
+#                                                              "selective": true, "lazy": true,
+#                                                              "cache_dir": "/pfad/tmp/ifc-data/cache", "stats": true,
+#                                                              "columnar": "/pfad/ifc-data.parquet", "geometry": true,
+#                                                              "mass": true, "layers": true
+# Antwort (ebenfalls eine JSON-Zeile):
+#   {"ok": true, "csv": "/pfad/ifc-data.csv", "elements": 1234, "seconds": 2.5}
+#   {"ok": false, "error": "..."}
+#
+# Server:
+#   python IFC2LCA_daemon.py --serve [--socket /pfad/ifc2lca.sock] [--group www-data]
+#   python IFC2LCA_daemon.py --stdio
+# Client (gleiche Kommandozeile wie IFC2LCA_elca.py, Fallback: im eigenen Prozess parsen):
+#   python IFC2LCA_daemon.py model.ifc ifc-data.csv
+#
+# Der Socket ist nur für Besitzer und Gruppe beschreibbar (0660, Gruppe per --group / IFC2LCA_SOCKET_GROUP,
+# z.B. die des Webservers). Alle Dateien eines Auftrags müssen unter tmp/ifc-data/ liegen
+# (überschreibbar per IFC2LCA_DATA_DIR), der Ergebnis-Cache zusätzlich unter DEFAULT_CACHE_DIR.
+import sys
+import os
+import json
+import contextlib
+import signal
+import socket
+import socketserver
+import time
+import grp
+from ExtractionCache import DEFAULT_CACHE_DIR
+
+# Standard: <baseDir>/tmp/ifc2lca.sock, überschreibbar per --socket oder IFC2LCA_SOCKET
+DEFAULT_SOCKET = os.environ.get('IFC2LCA_SOCKET', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'tmp', 'ifc2lca.sock'))
+
+# Standard: <baseDir>/tmp/ifc-data (ifcCreateDir in etc/config.ini)
+DATA_DIR = os.environ.get('IFC2LCA_DATA_DIR', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'tmp', 'ifc-data'))
+
+# Auftragsfelder mit Dateipfaden
+PATH_KEYS = ('ifc', 'csv', 'columnar', 'cache_dir')
+
+
+def inside(path, directory):
+    path, directory = os.path.realpath(path), os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+def checkPaths(job):
+    # Dateien nur im Upload-Verzeichnis lesen und schreiben (Begleitdateien liegen neben der CSV)
+    for key in PATH_KEYS:
+        path = job.get(key)
+        if path is None:
+            continue
+        allowed = [DATA_DIR] + ([DEFAULT_CACHE_DIR] if key == 'cache_dir' and DEFAULT_CACHE_DIR else [])
+        if not any(inside(path, directory) for directory in allowed):
+            raise ValueError('%s outside of %s: %s' % (key, DATA_DIR, path))
+
+
+def runJob(job):
+    # ifcopenshell wird erst im Server-Prozess geladen, der Client bleibt schlank
+    from IFC2LCA_elca import parseIfc
+
+    start = time.time()
+    try:
+        checkPaths(job)
+        elements = parseIfc(job['ifc'], job['csv'], job.get('workers', 1), job.get('flush_interval', 0),
+                            job.get('selective', False), job.get('lazy', False), job.get('cache_dir'),
+                            stats=job.get('stats', False), columnar_filename=job.get('columnar'),
+                            geometry=job.get('geometry', False), mass=job.get('mass', False),
+                            layers=job.get('layers', False))
+    except Exception as e:
+        return {'ok': False, 'error': '%s: %s' % (e.__class__.__name__, e)}
+    return {'ok': True, 'csv': job['csv'], 'elements': elements, 'seconds': round(time.time() - start, 3)}
+
+
+def handleLines(rfile, wfile):
+    for line in rfile:
+        line = line.decode('utf-8').strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            result = runJob(job)
+        except (ValueError, KeyError, TypeError) as e:
+            result = {'ok': False, 'error': 'invalid job: %s' % e}
+
+        wfile.write((json.dumps(result) + '\n').encode('utf-8'))
+        wfile.flush()
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        handleLines(self.rfile, self.wfile)
+
+
+class ForkingJobServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # je Verbindung ein per fork abgezweigter Prozess mit bereits geladenen Modulen: gleichzeitige Uploads
+    # warten nicht aufeinander, und ein abgebrochener Auftrag hält keine anderen auf
+    pass
+
+
+def serveSocket(socket_path, group=None):
+    import IFC2LCA_elca  # ifcopenshell + KG.py einmalig laden, die Kindprozesse erben sie
+
+    # bei SIGTERM sauber beenden und den Socket entfernen
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    # Rechte schon beim Anlegen einschränken, nicht erst nachträglich
+    umask = os.umask(0o117)
+    try:
+        server = ForkingJobServer(socket_path, JobHandler)
+    finally:
+        os.umask(umask)
+    if group:
+        os.chown(socket_path, -1, grp.getgrnam(group).gr_gid)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def serveStdio():
+    import IFC2LCA_elca  # ifcopenshell + KG.py einmalig laden
+
+    # stdout gehört dem Protokoll, Fehlerausgaben des Parsers gehen nach stderr
+    answers = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr):
+        handleLines(sys.stdin.buffer, answers)
+
+
+def submitJob(ifc_filename, csv_filename, socket_path=DEFAULT_SOCKET):
+    # None, wenn kein Daemon erreichbar ist
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+    except (OSError, AttributeError):
+        return None
+
+    with client, client.makefile('rwb') as stream:
+        job = {'ifc': os.path.abspath(ifc_filename), 'csv': os.path.abspath(csv_filename)}
+        if DEFAULT_CACHE_DIR:
+            # Aufruf aus ProjectIfcCtrl: wiederholte Uploads aus dem Ergebnis-Cache bedienen
+            job['cache_dir'] = os.path.abspath(DEFAULT_CACHE_DIR)
+        stream.write((json.dumps(job) + '\n').encode('utf-8'))
+        stream.flush()
+        answer = stream.readline()
+    if not answer:
+        return {'ok': False, 'error': 'no answer from parser daemon'}
+    return json.loads(answer.decode('utf-8'))
+
+
+# ON!
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    socket_path = DEFAULT_SOCKET
+    if '--socket' in args:
+        i = args.index('--socket')
+        socket_path = args[i + 1]
+        del args[i:i + 2]
+    socket_group = os.environ.get('IFC2LCA_SOCKET_GROUP')
+    if '--group' in args:
+        i = args.index('--group')
+        socket_group = args[i + 1]
+        del args[i:i + 2]
+
+    if args == ['--serve']:
+        serveSocket(socket_path, socket_group)
+    elif args == ['--stdio']:
+        serveStdio()
+    elif len(args) == 2:
+        result = submitJob(args[0], args[1], socket_path)
+        if result is None:
+            # kein Daemon gestartet -> wie bisher im eigenen Prozess parsen
+            from IFC2LCA_elca import parseIfc
+            parseIfc(args[0], args[1], cache_dir=DEFAULT_CACHE_DIR)
+        elif not result['ok']:
+            sys.exit(result['error'])
+    else:
+        sys.exit('Keine korrekte Anzahl Argumente')
@@ -1,76 +1,54 @@
 # -*- coding: utf-8 -*-
-import sys   
+import os
+import argparse
+import multiprocessing
 import ifcopenshell
 import csv
+import contextlib
 from KG import getKG, getKGname, distribution_system_finder
-
-prefixes = {None: 1, 'EXA': 1e18, 'PETA': 1e15, 'TERA': 1e12, 'GIGA': 1e9, 'MEGA':
-    1e6, 'KILO': 1e3, 'HECTO': 1e2, 'DECA': 1e1, 'DECI': 1e-1, 'CENTI':
-                1e-2, 'MILLI': 1e-3, 'MICRO': 1e-6, 'NANO': 1e-9, 'PICO': 1e-12,
-            'FEMTO': 1e-15, 'ATTO': 1e-18}
-
-
-def getSIUnits(model):
-    SIUnit_length_list, SIUnit_area_list, SIUnit_volume_list, SIUnit_mass_list = [], [], [], []
-    for SIUnit in model.by_type("IfcSIUnit"):
-        for SIUnit_name in SIUnit:
-            if SIUnit_name == 'LENGTHUNIT':
-                SIUnit_length_list.append([SIUnit.Prefix, SIUnit.Name])
-            elif SIUnit_name == 'AREAUNIT':
-                SIUnit_area_list.append([SIUnit.Prefix, SIUnit.Name])
-            elif SIUnit_name == 'VOLUMEUNIT':
-                SIUnit_volume_list.append([SIUnit.Prefix, SIUnit.Name])
-            elif SIUnit_name == 'MASSUNIT':
-                SIUnit_mass_list.append([SIUnit.Prefix, SIUnit.Name])
-
-    return SIUnit_length_list, SIUnit_area_list, SIUnit_volume_list, SIUnit_mass_list
-
-
-def property_finder(ifc_element, property_set, property_name):
-    for s in ifc_element.IsDefinedBy:
-        if hasattr(s, 'RelatingPropertyDefinition'):
-            if s.RelatingPropertyDefinition.Name == property_set:
-                if hasattr(s.RelatingPropertyDefinition, 'HasProperties'):
-                    for v in s.RelatingPropertyDefinition.HasProperties:
-                        if v.Name == property_name:
-                            return v.NominalValue.wrappedValue
-                elif hasattr(s.RelatingPropertyDefinition, 'Quantities'):
-                    for v in s.RelatingPropertyDefinition.Quantities:
-                        if v.Name == property_name:
-                            for attr, value in vars(v).items():
-                                if attr.endswith('Value'):
-                                    return value
-    return None
-
-
-def property_finder_unit(ifc_element, property_set, property_name):
-    for s in ifc_element.IsDefinedBy:
-        if hasattr(s, 'RelatingPropertyDefinition'):
-            if s.RelatingPropertyDefinition.Name == property_set:
-                if hasattr(s.RelatingPropertyDefinition, 'HasProperties'):
-                    for v in s.RelatingPropertyDefinition.HasProperties:
-                        if v.Name == property_name:
-                            return v.Unit
-                elif hasattr(s.RelatingPropertyDefinition, 'Quantities'):
-                    for v in s.RelatingPropertyDefinition.Quantities:
-                        if v.Name == property_name:
-                            for attr, value in vars(v).items():
-                                if attr.endswith('Value'):
-                                    return v.Unit
-    return None
-
-
-def material_property_finder(material, property_set, property_name):
-    if hasattr(material, 'HasProperties'):  # 2x3 ToDo: Materialpropertyset missing
-        for e in material.HasProperties:
-            if e.Name == property_set:
-                for v in e.Properties:
-                    if v.Name == property_name:
-                        return v.NominalValue.wrappedValue
-    return None
+from PropertyIndex import build_property_index, reset_property_index, quantity_finder, psets_of
+from MaterialIndex import build_material_index, material_result, material_layers, layer_thicknesses, \
+    reset_material_cache
+from MaterialMass import layer_masses, total_mass, mass_row, massHeader
+from LayerExport import layer_rows, layerHeader
+from RelationIndex import build_relation_index, reset_relation_index, storey_of, system_of, relating_materials_of
+from TypeIndex import build_type_index, reset_type_index, type_of, predefined_type
+from StepFilter import open_selective
+from StepReader import open_lazy
+import ExtractionCache
+from Instrumentation import timer, enable_stats, disable_stats, stats_enabled, record_element, record_stage, \
+    record_model_step, merge_stats, stats_report, write_stats
+from ErrorReport import reset_errors, record_error, take_errors, merge_errors, error_report, write_errors
+from ColumnarExport import ColumnBuilder, check_format
+from GeometryQuantities import build_geometry_index, reset_geometry_index, geometry_quantity
+from Units import build_unit_context, reset_unit_context, unit_context_key, si_value
+from IncrementalExtraction import incremental_rows, load_state, save_state, write_delta, fingerprint, stable_psets
+
+# Mengenangaben je IFC-Klasse, gesucht in QTo_WallBaseQuantities, BaseQuantities, Qto_*BaseQuantities
+area_quantities = {"IfcWall": "NetSideArea",
+                   "IfcWallStandardCase": "NetSideArea",
+                   "IfcColumn": "GrossSurfaceArea",  # outersurfacearea, totalsurfacearea
+                   "IfcCovering": "GrossSurfaceArea",
+                   "IfcSlab": "GrossArea",
+                   "IfcRoof": "GrossArea",
+                   "IfcShadingDevice": "NetArea"}
+
+volume_quantities = {"IfcWall": "GrossVolume",
+                     "IfcWallStandardCase": "GrossVolume",
+                     "IfcDoor": "Volume",
+                     "IfcWindow": "Volume",
+                     "IfcColumn": "GrossVolume",
+                     "IfcCovering": "GrossVolume",
+                     "IfcSlab": "GrossVolume",
+                     "IfcRoof": "GrossVolume",
+                     "IfcShadingDevice": "Volume"}
 
 
 class eLCA_Produkt:
+    # feste Felder statt __dict__ je Instanz; die Entity wird nach getInfos freigegeben
+    __slots__ = ('product', 'guid', 'name', 'storey', 'type', 'enum', 'system', 'area', 'area_unit', 'KG', 'KGname',
+                 'primary_mass', 'layers', 'layer_masses', 'material', 'material_density', 'volume', 'layerthickness')
+
     def __init__(self, p):
         self.product = p
         self.guid = None
@@ -84,8 +62,10 @@ class eLCA_Produkt:
         self.KG = None
         self.KGname = None
         self.primary_mass = None
+        self.layers = None
+        self.layer_masses = None
         self.material = None
-        self.area_density = None
+        self.material_density = None
         self.volume = None
         self.layerthickness = None
         self.getInfos()
@@ -101,304 +81,450 @@ class eLCA_Produkt:
         # Type
         self.type = self.product.is_a()
 
-        # Storey
-        try:
-            self.storey = self.getStorey()
-        except:
-            print("ERROR in STOREY CALCULATION", self.product)
-
-        # Area
-        try:
-            self.area, self.area_unit = self.getArea()
-            if self.area_unit is None and self.area is not None:
-                self.area_unit = SIUnit_area
-            if self.area_unit and self.area:  # Umrechnung der Einheit auf SI-Einheit (ohne Präfix)
-                self.area *= prefixes[self.area_unit[0]]
-                self.area_unit = self.area_unit[1]
-
-        except:
-            print("ERROR in area CALCULATION", self.product)
-        # if self.area_unit is None:
-
-        # Material
-        try:
-            self.material, self.material_density = self.getMaterial()
-        except:
-            print("ERROR in material CALCULATION", self.product)
-
-        # Distribution System
-        try:
-            self.system = distribution_system_finder(self.product)
-        except:
-            print("ERROR in Distribution System CALCULATION", self.product)
-
-        # Enumeration Type
-        try:
-            self.enum = self.getType()
-        except:
-            print("ERROR in PredefinedType CALCULATION", self.product)
-
-        # Kostengruppe Nummer
-
-        try:
-            self.KG = getKG(self)
-        except:
-            print("ERROR in KG CALCULATION", self.product)
-
-        # Kostengruppe Name
-        try:
-            self.KGname = getKGname(self)
-        except:
-            print("ERROR in KG Name CALCULATION", self.product)
-
-        # Volume
-        try:
-            self.volume = self.getVolume()
-        except:
-            print("ERROR in Volume CALCULATION", self.product)
-
-        # Primary Mass
-        try:
-            if self.area_density is not None and self.volume is not None:
-                self.primary_mass = self.volume * self.area_density
-        except:
-            print("ERROR in Primary Mass CALCULATION", self.product)
-
-        # Layer Thickness
-        try:
-            self.layerthickness = self.getLayerThickness()
-        except:
-            print("ERROR in Layer Thickness CALCULATION", self.product)
+        # Stufen der Reihe nach, ein Fehler in einer Stufe bricht die übrigen nicht ab
+        record_element(self.type)
+        measure = stats_enabled()
+        for label, stage in infoStages:
+            if measure:
+                started = timer()
+            try:
+                stage(self)
+            except Exception as error:
+                # gesammelt statt ausgegeben (siehe ErrorReport.py)
+                record_error(label, self.type, self.guid, error)
+            if measure:
+                record_stage(self.type, label, timer() - started)
+
+        # alle Werte ermittelt -> Referenz auf die ifcopenshell-Entity nicht länger halten
+        self.product = None
+
+    # Storey
+    def setStorey(self):
+        self.storey = self.getStorey()
+
+    # Area (in m², siehe Units.py)
+    def setArea(self):
+        self.area = self.getArea()
+        self.area_unit = 'SQUARE_METRE' if self.area is not None else None
+
+    # Material
+    def setMaterial(self):
+        self.material, self.material_density = self.getMaterial()
+
+    # Distribution System
+    def setSystem(self):
+        self.system = distribution_system_finder(self.product)
+
+    # Enumeration Type
+    def setEnum(self):
+        self.enum = self.getType()
+
+    # Kostengruppe Nummer
+    def setKG(self):
+        self.KG = getKG(self)
+
+    # Kostengruppe Name
+    def setKGname(self):
+        self.KGname = getKGname(self)
+
+    # Volume
+    def setVolume(self):
+        self.volume = self.getVolume()
+
+    # Primary Mass (in kg je Schicht und gesamt, siehe MaterialMass.py)
+    def setPrimaryMass(self):
+        self.layers = material_layers(self.getRelatingMaterials())
+        self.layer_masses = layer_masses(self.layers, self.area, self.volume)
+        self.primary_mass = total_mass(self.layer_masses)
+
+    # Layer Thickness
+    def setLayerThickness(self):
+        self.layerthickness = self.getLayerThickness()
 
     def getStorey(self):
-        try:
-            for rel_contained in self.product.ContainedInStructure:
-                return rel_contained.RelatingStructure.Name
-        except:
-            return None
+        return storey_of(self.product)
 
     def getArea(self):
-        def Wall():
-            area = property_finder(p, "QTo_WallBaseQuantities", "NetSideArea")
-            area_unit = property_finder_unit(p, "QTo_WallBaseQuantities", "NetSideArea")
-            if area is None:
-                return property_finder(self.product, "BaseQuantities", "NetSideArea"), property_finder_unit(
-                    self.product, "BaseQuantities", "NetSideArea")
-            else:
-                return area, area_unit
-
-        def Window_Door():
+        if self.type in ("IfcDoor", "IfcWindow"):
+            # Öffnungsmaße in der Längeneinheit des Projekts
             try:
-                return self.product.OverallHeight * self.product.OverallWidth, None
+                return si_value(self.product.OverallHeight, 'LENGTHUNIT') * \
+                    si_value(self.product.OverallWidth, 'LENGTHUNIT')
             except:
-                return None, None
-
-        def Column():
-            area = property_finder(self.product, "QTo_WallBaseQuantities",
-                                   "GrossSurfaceArea")  # outersurfacearea, totalsurfacearea
-            area_unit = property_finder_unit(self.product, "QTo_WallBaseQuantities", "GrossSurfaceArea")
-            if area is None:
-                return property_finder(self.product, "BaseQuantities", "GrossSurfaceArea"), property_finder_unit(
-                    self.product, "BaseQuantities", "GrossSurfaceArea")
-            else:
-                return area, area_unit
-
-        def Covering():
-            # not in this file
-            area = property_finder(self.product, "QTo_WallBaseQuantities", "GrossSurfaceArea")
-            area_unit = property_finder_unit(self.product, "QTo_WallBaseQuantities", "GrossSurfaceArea")
-            if area is None:
-                return property_finder(self.product, "BaseQuantities", "GrossSurfaceArea"), property_finder_unit(
-                    self.product, "BaseQuantities", "GrossSurfaceArea")
-            else:
-                return area, area_unit
-
-        def Slab_Roof():
-            area = property_finder(self.product, "QTo_WallBaseQuantities", "GrossArea")
-            area_unit = property_finder_unit(self.product, "QTo_WallBaseQuantities", "GrossArea")
-            if area is None:
-                return property_finder(self.product, "BaseQuantities", "GrossArea"), property_finder_unit(self.product,
-                                                                                                          "BaseQuantities",
-                                                                                                          "GrossArea")
-            else:
-                return area, area_unit
-
-        def ShadingDevice():
-            # not in this file
-            area = property_finder(self.product, "QTo_WallBaseQuantities", "NetArea")
-            area_unit = property_finder_unit(self.product, "QTo_WallBaseQuantities", "NetArea")
-            if area is None:
-                return property_finder(self.product, "BaseQuantities", "NetArea"), property_finder_unit(self.product,
-                                                                                                        "BaseQuantities",
-                                                                                                        "NetArea")
-            else:
-                return area, area_unit
-
-        switcher = {"IfcWall": Wall,
-                    "IfcWallStandardCase": Wall,
-                    "IfcDoor": Window_Door,
-                    "IfcWindow": Window_Door,
-                    "IfcColumn": Column,
-                    "IfcCovering": Covering,
-                    "IfcSlab": Slab_Roof,
-                    "IfcRoof": Slab_Roof,
-                    "IfcShadingDevice": ShadingDevice}
-
-        func = switcher.get(self.product.is_a(), lambda: (None, None))
-        return func()
+                return None
+
+        quantity_name = area_quantities.get(self.type)
+        if quantity_name is None:
+            return None
+        area, unit = quantity_finder(self.product, quantity_name)
+        if area is None:
+            # ohne Mengenangabe ggf. aus der Geometrie (siehe GeometryQuantities.py), bereits in m²
+            return geometry_quantity(self.product, quantity_name)
+        return si_value(area, 'AREAUNIT', unit)
 
     def getVolume(self):
-        def Wall_Column_Covering_Slab_Roof():
-            volume = property_finder(self.product, "QTo_WallBaseQuantities", "GrossVolume")
-            if volume is None:
-                return property_finder(self.product, "BaseQuantities", "GrossVolume")
-            else:
-                return volume
-
-        def Window_Door_ShadingDevice():
-            volume = property_finder(self.product, "QTo_WallBaseQuantities", "Volume")
-            if volume is None:
-                return property_finder(self.product, "BaseQuantities", "Volume")
-            else:
-                return volume
-
-        switcher = {"IfcWall": Wall_Column_Covering_Slab_Roof,
-                    "IfcWallStandardCase": Wall_Column_Covering_Slab_Roof,
-                    "IfcDoor": Window_Door_ShadingDevice,
-                    "IfcWindow": Window_Door_ShadingDevice,
-                    "IfcColumn": Wall_Column_Covering_Slab_Roof,
-                    "IfcCovering": Wall_Column_Covering_Slab_Roof,
-                    "IfcSlab": Wall_Column_Covering_Slab_Roof,
-                    "IfcRoof": Wall_Column_Covering_Slab_Roof,
-                    "IfcShadingDevice": Window_Door_ShadingDevice}
-
-        func = switcher.get(self.product.is_a(), lambda: None)
-        return func()
+        quantity_name = volume_quantities.get(self.type)
+        if quantity_name is None:
+            return None
+        volume, unit = quantity_finder(self.product, quantity_name)
+        if volume is None:
+            return geometry_quantity(self.product, quantity_name)
+        return si_value(volume, 'VOLUMEUNIT', unit)
 
     def getType(self):
-        if hasattr(self.product, 'PredefinedType'):
-            enum = self.product.PredefinedType
-        else:
+        # NOTDEFINED bzw. ohne Attribut (IFC2x3: IfcWallStandardCase, IfcWall, IfcWindow ...)
+        # -> PredefinedType des Typobjekts
+        enum = predefined_type(self.product)
+        if enum is None and not hasattr(self.product, 'PredefinedType'):
             enum = "STANDARD"
         return enum
 
+    def getRelatingMaterials(self):
+        return relatingMaterials(self.product)
+
     def getLayerThickness(self):
-        layerThickness_list = []
-        for relAssociates in self.product.HasAssociations:
-            if relAssociates.is_a('IfcRelAssociatesMaterial'):
-                relatingMaterial = relAssociates.RelatingMaterial
-                if relatingMaterial.is_a("IfcMaterialLayerSetUsage"):
-                    for materialLayer in relatingMaterial.ForLayerSet.MaterialLayers:
-                        layerThickness_list.append(materialLayer.LayerThickness)
-                if relatingMaterial.is_a("IfcMaterialLayerSet"):
-                    for materialLayer in relatingMaterial.MaterialLayers:
-                        if materialLayer.is_a('IfcMaterialLayer'):
-                            layerThickness_list.append(materialLayer.LayerThickness)
-        return layerThickness_list
+        return layer_thicknesses(self.getRelatingMaterials())
 
     def getMaterial(self):
-        material_list = []
-        densities = []
-        for relAssociates in self.product.HasAssociations:
-            if relAssociates.is_a('IfcRelAssociatesMaterial'):
-                relatingMaterial = relAssociates.RelatingMaterial
-                if relatingMaterial.is_a("IfcMaterial"):
-                    material_list.append(relatingMaterial.Name)
-                    densities.append(material_property_finder(relatingMaterial, 'Pset_MaterialCommon', 'MassDensity'))
-                elif relatingMaterial.is_a("IfcMaterialConstituentSet"):
-                    for materialConstituent in relatingMaterial.MaterialConstituents:
-                        if materialConstituent.is_a("IfcMaterialConstituent"):
-                            material_list.append(materialConstituent.Material.Name)
-                            densities.append(
-                                material_property_finder(materialConstituent.Material, 'Pset_MaterialCommon',
-                                                         'MassDensity'))
-                elif relatingMaterial.is_a("IfcMaterialLayerSet"):
-                    for materialLayer in relatingMaterial.MaterialLayers:
-                        if materialLayer.is_a('IfcMaterialLayer'):
-                            material_list.append(materialLayer.Material.Name)
-                            densities.append(
-                                material_property_finder(materialLayer.Material, 'Pset_MaterialCommon', 'MassDensity'))
-                elif relatingMaterial.is_a("IfcMaterialLayerSetUsage"):
-                    for materialLayer in relatingMaterial.ForLayerSet.MaterialLayers:
-                        if materialLayer.is_a('IfcMaterialLayer'):
-                            material_list.append(materialLayer.Material.Name)
-                            densities.append(
-                                material_property_finder(materialLayer.Material, 'Pset_MaterialCommon', 'MassDensity'))
-                elif relatingMaterial.is_a("IfcMaterialProfileSet"):
-                    for materialProfile in relatingMaterial.MaterialProfiles:
-                        if materialProfile.is_a('IfcMaterialProfile'):
-                            material_list.append(materialProfile.Material.Name)
-                            densities.append(material_property_finder(materialProfile.Material, 'Pset_MaterialCommon',
-                                                                      'MassDensity'))
-                elif relatingMaterial.is_a("IfcMaterialProfileSetUsage"):
-                    for materialProfile in relatingMaterial.ForProfileSet.MaterialProfiles:
-                        if materialProfile.is_a('IfcMaterialProfile'):
-                            material_list.append(materialProfile.Material.Name)
-                            densities.append(material_property_finder(materialProfile.Material, 'Pset_MaterialCommon',
-                                                                      'MassDensity'))
-                elif relatingMaterial.is_a('IfcMaterialList'):
-                    for materialList in relatingMaterial:
-                        for material in materialList:
-                            if material.is_a('IfcMaterial'):
-                                material_list.append(material.Name)
-                                densities.append(
-                                    material_property_finder(material, 'Pset_MaterialCommon', 'MassDensity'))
-
-        if len(densities) == 1:
-            densities = densities[0]
-        elif len(material_list) == 0:
-            densities = None
-
-        if len(material_list) == 1:
-            return material_list[0], densities
-        elif len(material_list) == 0:
-            return "", densities
+        return material_result(self.getRelatingMaterials())
+
+
+# Stufen von getInfos: (Bezeichnung in Fehlerbericht und Messwerten, Methode)
+infoStages = (("STOREY", eLCA_Produkt.setStorey),
+              ("area", eLCA_Produkt.setArea),
+              ("material", eLCA_Produkt.setMaterial),
+              ("Distribution System", eLCA_Produkt.setSystem),
+              ("PredefinedType", eLCA_Produkt.setEnum),
+              ("KG", eLCA_Produkt.setKG),
+              ("KG Name", eLCA_Produkt.setKGname),
+              ("Volume", eLCA_Produkt.setVolume),
+              ("Primary Mass", eLCA_Produkt.setPrimaryMass),
+              ("Layer Thickness", eLCA_Produkt.setLayerThickness))
+
+
+def relatingMaterials(p):
+    # ohne eigene Materialzuordnung gilt das Material des Typobjekts
+    materials = relating_materials_of(p)
+    if not materials:
+        type_object = type_of(p)
+        if type_object is not None:
+            materials = relating_materials_of(type_object)
+    return materials
+
+
+def productFingerprint(p):
+    # alles, was getInfos für das Element liest (siehe IncrementalExtraction.py)
+    type_object = type_of(p)
+    try:
+        materials = relatingMaterials(p)
+        material = material_result(materials), layer_thicknesses(materials)
+    except Exception:
+        material = 'ERROR'
+    return fingerprint(p.is_a(), p.Name, getattr(p, 'PredefinedType', None),
+                       getattr(p, 'OverallHeight', None), getattr(p, 'OverallWidth', None),
+                       storey_of(p), system_of(p),
+                       type_object and (type_object.is_a(), getattr(type_object, 'PredefinedType', None)),
+                       stable_psets(psets_of(p)), material)
+
+
+# nicht exportierte IFC-Klassen
+excludedTypes = ["IfcVirtualElement", "IfcAnnotation", "IfcOpeningElement", "IfcSite", "IfcSpace",
+                 "IfcBuilding", "IfcBuildingStorey", "IfcDistributionPort"]
+
+csvHeader = ['Name', 'KostengruppeNr', 'Flaeche', 'Masse', 'Typ', 'Stockwerk', 'Material', 'GUID', 'PredefinedType',
+             'Unit', 'KostengruppeName']
+# der eLCA-Import erwartet genau diese Spalten
+csvColumns = len(csvHeader)
+
+
+def exportedProducts(model):
+    for p in model.by_type("IfcProduct"):
+        if p.is_a() in excludedTypes or p.Representation is None:
+            continue
+        yield p
+
+
+def lacksQuantities(p):
+    # Fläche oder Volumen nicht in den Quantity-Sets -> Kandidat für GeometryQuantities.py
+    area_name = area_quantities.get(p.is_a())
+    volume_name = volume_quantities.get(p.is_a())
+    return (area_name is not None and quantity_finder(p, area_name)[0] is None) or \
+           (volume_name is not None and quantity_finder(p, volume_name)[0] is None)
+
+
+def csvRow(P):
+    # Masse bleibt leer, der eLCA-Import läse sie als Volumen (siehe MaterialMass.py)
+    return [P.name, str(P.KG), P.area, None, P.type, P.storey, P.material, P.guid, P.enum, P.area_unit, P.KGname]
+
+
+def exportRow(P):
+    # CSV-Zeile + Felder für Begleitdateien (Gesamtmasse, Schichtmassen, Schichten), geschrieben wird nur csvHeader;
+    # Schichten als Listen wie nach dem JSON-Zustand der inkrementellen Extraktion, sonst wäre jede Zeile "geändert"
+    layers = [list(layer) for layer in P.layers] if P.layers is not None else None
+    return csvRow(P) + [P.primary_mass, P.layer_masses, layers]
+
+
+def extractRows(model):
+    # Zeile für Zeile: das eLCA_Produkt (und damit die Referenz auf die Entity) wird sofort wieder verworfen
+    for p in exportedProducts(model):
+        yield exportRow(eLCA_Produkt(p))
+
+
+# ----- Parallele Extraktion ----- #
+# Die Worker entstehen per fork und teilen sich Modell und Property-Index (copy-on-write);
+# übertragen werden nur Entity-Ids hin und fertige CSV-Zeilen zurück.
+_worker_model = None
+
+
+def extractChunk(product_ids):
+    # Messwerte und Fehler je Block zurück an den Hauptprozess; je Block frisch zählen (vom Hauptprozess
+    # geerbte Werte nicht doppelt) und danach wieder einschalten, sonst zählt nur der erste Block des Workers
+    measure = stats_enabled()
+    if measure:
+        enable_stats()
+    rows = [exportRow(eLCA_Produkt(_worker_model.by_id(i))) for i in product_ids]
+    stats = disable_stats()
+    if measure:
+        enable_stats()
+    return rows, stats, take_errors()
+
+
+def extractRowsParallel(model, workers):
+    global _worker_model
+
+    # nach GUID vorsortiert und in zusammenhängende Blöcke geteilt -> Ausgabe unabhängig
+    # von der Worker-Anzahl in GUID-Reihenfolge, ohne alle Zeilen zwischenzuspeichern
+    product_ids = [i for guid, i in sorted((p.GlobalId, p.id()) for p in exportedProducts(model))]
+    chunksize = len(product_ids) // (workers * 8) + 1
+    chunks = [product_ids[i:i + chunksize] for i in range(0, len(product_ids), chunksize)]
+
+    _worker_model = model
+    try:
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            for chunk_rows, chunk_stats, chunk_errors in pool.imap(extractChunk, chunks):
+                merge_stats(chunk_stats)
+                merge_errors(chunk_errors)
+                for row in chunk_rows:
+                    yield row
+    finally:
+        _worker_model = None
+
+
+def prepareModel(model):
+    # modellweite Vorarbeiten: Einheiten und Property-Index
+    # Faktoren aller Projekteinheiten auf SI, vor dem Material-Index (Rohdichten, Schichtdicken)
+    build_unit_context(model)
+
+    # Typobjekte, Property- und Quantity-Sets einmalig für das ganze Modell einlesen
+    build_property_index(model, build_type_index(model))
+    # Geschoss-, System- und Materialzuordnungen einmalig vorwärts lesen
+    build_relation_index(model)
+    # Materialaufbauten (Layer-/Profile-Sets usw.) einmalig auflösen
+    build_material_index(model)
+
+
+def parseIfc(ifc_filename, csv_filename, workers=1, flush_interval=0, selective=False, lazy=False, cache_dir=None,
+             state_filename=None, delta_filename=None, stats=False, columnar_filename=None, geometry=False,
+             mass=False, layers=False):
+    # cache_dir: Ergebnis-Cache (siehe ExtractionCache.py), None = immer neu parsen
+    # state_filename: inkrementelle Extraktion (siehe IncrementalExtraction.py), ohne Cache
+    # stats: Messwerte nach <csv>-stats.json (siehe Instrumentation.py)
+    # columnar_filename: zusätzlich spaltenweise als .npz/.parquet/.arrow (siehe ColumnarExport.py)
+    # geometry: fehlende Flächen/Volumen aus der Geometrie (siehe GeometryQuantities.py)
+    # mass: Gesamt- und Schichtmassen nach <csv>-mass.csv (siehe MaterialMass.py)
+    # layers: eine Zeile je Materialschicht nach <csv>-layers.csv (siehe LayerExport.py)
+    if not cache_dir or state_filename:
+        return extractIfc(ifc_filename, csv_filename, workers, flush_interval, selective, lazy,
+                          state_filename, delta_filename, stats, columnar_filename, geometry, mass, layers)
+
+    # parallele Extraktion liefert nach GUID sortierte Zeilen -> eigener Cache-Eintrag
+    key = ExtractionCache.cache_key(ifc_filename, 'sorted' if workers > 1 else 'serial',
+                                    'geometry' if geometry else 'quantities', 'mass' if mass else '',
+                                    'layers' if layers else '',
+                                    os.path.splitext(columnar_filename)[1].lower() if columnar_filename else '')
+    sidecars = {'.errors.json': errorsFilename(csv_filename)}
+    if columnar_filename:
+        # enthält die Masse, lässt sich also nicht aus der CSV nachbilden
+        sidecars['.columnar' + os.path.splitext(columnar_filename)[1].lower()] = columnar_filename
+    if mass:
+        sidecars['.mass.csv'] = massFilename(csv_filename)
+    if layers:
+        sidecars['.layers.csv'] = layersFilename(csv_filename)
+    count = ExtractionCache.lookup(cache_dir, key, csv_filename, sidecars)
+    if count is None:
+        count = extractIfc(ifc_filename, csv_filename, workers, flush_interval, selective, lazy, stats=stats,
+                           columnar_filename=columnar_filename, geometry=geometry, mass=mass, layers=layers)
+        ExtractionCache.store(cache_dir, key, csv_filename, sidecars)
+        return count
+
+    if stats:
+        write_stats(statsFilename(csv_filename), {'elements': count, 'cached': True})
+    return count
+
+
+def statsFilename(csv_filename):
+    return os.path.splitext(csv_filename)[0] + '-stats.json'
+
+
+def errorsFilename(csv_filename):
+    return os.path.splitext(csv_filename)[0] + '-errors.json'
+
+
+def massFilename(csv_filename):
+    return os.path.splitext(csv_filename)[0] + '-mass.csv'
+
+
+def layersFilename(csv_filename):
+    return os.path.splitext(csv_filename)[0] + '-layers.csv'
+
+
+def extractIfc(ifc_filename, csv_filename, workers=1, flush_interval=0, selective=False, lazy=False,
+               state_filename=None, delta_filename=None, stats=False, columnar_filename=None, geometry=False,
+               mass=False, layers=False):
+    if (lazy or selective) and geometry:
+        raise ValueError('Mengen aus der Geometrie brauchen das vollständig geladene Modell')
+    if columnar_filename:
+        check_format(columnar_filename)
+    if stats:
+        enable_stats()
+    reset_errors()
+    started = timer()
+
+    # model = ifcopenshell.open("AC20-FZK-Haus.ifc")
+    if lazy:
+        # mmap + Offset-Index, Entities erst bei Zugriff dekodieren (siehe StepReader.py)
+        model = open_lazy(ifc_filename)
+    elif selective:
+        # ohne Geometrie laden (siehe StepFilter.py)
+        model = open_selective(ifc_filename)
+    else:
+        model = ifcopenshell.open(ifc_filename)
+    record_model_step('load', timer() - started)
+
+    try:
+        step_started = timer()
+        prepareModel(model)
+        record_model_step('indexes', timer() - step_started)
+        if geometry:
+            # einmal vorab für alle Elemente ohne Mengenangaben, die Worker erben das Ergebnis
+            step_started = timer()
+            build_geometry_index(model, (p for p in exportedProducts(model) if lacksQuantities(p)))
+            record_model_step('geometry', timer() - step_started)
+        step_started = timer()
+
+        if state_filename:
+            # inkrementell (seriell): unveränderte Elemente aus dem letzten Zustand übernehmen
+            previous = load_state(state_filename)
+            version = '%s %s %s' % (ExtractionCache.parser_version(), unit_context_key(), geometry)
+            state, delta = {}, []
+            # Mengen aus der Geometrie stehen nicht im Fingerabdruck -> diese Elemente immer neu auswerten
+            reusable = (lambda p: not lacksQuantities(p)) if geometry else None
+            rows = incremental_rows(((p.GlobalId, p) for p in exportedProducts(model)), previous, version,
+                                    state, delta, lambda p: exportRow(eLCA_Produkt(p)), productFingerprint, reusable)
+        elif workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            rows = extractRowsParallel(model, workers)
         else:
-            material_list_string = str(material_list).replace("[", "")
-            material_list_string = material_list_string.replace("]", "")
-            material_list_string = material_list_string.replace(";", ",")
-            return material_list_string, densities
+            rows = extractRows(model)
+
+        with contextlib.ExitStack() as files:
+            file = files.enter_context(open(csv_filename, 'w', encoding='utf-8'))
+            writer = csv.writer(file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(csvHeader)
+            if mass:
+                mass_file = files.enter_context(open(massFilename(csv_filename), 'w', encoding='utf-8'))
+                mass_writer = csv.writer(mass_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                mass_writer.writerow(massHeader)
+            if layers:
+                layer_file = files.enter_context(open(layersFilename(csv_filename), 'w', encoding='utf-8'))
+                layer_writer = csv.writer(layer_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                layer_writer.writerow(layerHeader)
+
+            # flush_interval > 0: alle n Zeilen auf die Platte, damit die Datei schon während
+            # der Extraktion gelesen werden kann
+            columns = ColumnBuilder(csvHeader) if columnar_filename else None
+            count = 0
+            for row in rows:
+                writer.writerow(row[:csvColumns])
+                row_mass, row_layer_masses, row_layers = row[csvColumns:]
+                if mass:
+                    mass_writer.writerow(mass_row(row[7], row_mass, row_layer_masses))
+                if layers:
+                    layer_writer.writerows(layer_rows(row[7], row[0], row[4], row[1], row[2], row_layers,
+                                                      row_layer_masses))
+                if columns is not None:
+                    # Masse nur in der CSV leer (PHP-Import), spaltenweise als Zahl
+                    columns.append(row[:3] + [row_mass] + row[4:csvColumns])
+                count += 1
+                if flush_interval and count % flush_interval == 0:
+                    file.flush()
+
+        if state_filename:
+            save_state(state_filename, version, state)
+            write_delta(delta_filename or os.path.splitext(csv_filename)[0] + '-delta.csv', csvHeader, delta)
+
+        if columns is not None:
+            columns.write(columnar_filename)
+
+        # Fehler je Stufe und IFC-Klasse, auch wenn keine aufgetreten sind
+        write_errors(errorsFilename(csv_filename), error_report(elements=count))
+
+        if stats:
+            record_model_step('extract', timer() - step_started)
+            seconds = timer() - started
+            write_stats(statsFilename(csv_filename),
+                        stats_report(disable_stats(), elements=count, seconds=round(seconds, 6),
+                                     elements_per_second=round(count / seconds, 1) if seconds else None))
+        return count
+    finally:
+        disable_stats()
+        reset_errors()
+        # der Parser-Daemon verarbeitet viele Modelle nacheinander -> Index nicht über den Auftrag hinaus halten
+        reset_property_index()
+        reset_relation_index()
+        reset_type_index()
+        reset_material_cache()
+        reset_geometry_index()
+        reset_unit_context()
+        if lazy:
+            model.close()
+
 
 # ON! 
-if len(sys.argv) != 3:
-   sys.exit('Keine korrekte Anzahl Argumente') 
-
-# model = ifcopenshell.open("AC20-FZK-Haus.ifc")
-model = ifcopenshell.open(sys.argv[1])
-
-schema = model.schema
-
-SIUnit_length_list, SIUnit_area_list, SIUnit_volume_list, SIUnit_mass_list = getSIUnits(model)
-#print(SIUnit_length_list, SIUnit_area_list, SIUnit_volume_list, SIUnit_mass_list)
-if len(SIUnit_area_list) == 0:
-    SIUnit_area = [None, 'SQUARE_METRE']
-else:
-    SIUnit_area = SIUnit_area_list[0]
-
-#print(schema)
-# print(SIUnit_area)
-
-Produkte = []
-
-for p in model.by_type("IfcProduct"):
-    if p.is_a() in ["IfcVirtualElement", "IfcAnnotation", "IfcOpeningElement", "IfcSite", "IfcSpace",
-                    "IfcBuilding", "IfcBuildingStorey", "IfcDistributionPort"] or p.Representation is None:
-        continue
-    Produkte.append(eLCA_Produkt(p))
-
-# with open('IFC_data.csv', mode='w') as file:
-#with open(sys.argv[2], 'w', encoding='utf-8') as file:
-#   writer = csv.writer(file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-#   writer.writerow(
-#       ['GUID', 'Name', 'Stockwerk', 'Klasse', 'Typ', 'System', 'Kostengruppe Nummer', 'Kostengruppe Name', 'Material', 'Masse',
-#        'Flaeche', 'Flaecheneinheit'])
-#   for P in Produkte:
-#       writer.writerow(
-#           [P.guid, P.name, P.storey, P.type, P.enum, P.system, P.KG, P.KGname, P.material, P.primary_mass, P.area, P.area_unit])
-
-with open(sys.argv[2], 'w', encoding='utf-8') as file:
-    writer = csv.writer(file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-    writer.writerow(['Name','KostengruppeNr','Flaeche','Masse','Typ','Stockwerk','Material','GUID','PredefinedType','Unit','KostengruppeName'])
-    for P in Produkte:
-        writer.writerow([P.name, str(P.KG), P.area, P.primary_mass, P.type, P.storey, P.material, P.guid, P.enum, P.area_unit, P.KGname])        
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='IFC -> eLCA CSV')
+    parser.add_argument('ifc')
+    parser.add_argument('csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Anzahl paralleler Prozesse für die Elementextraktion (Ausgabe dann nach GUID sortiert)')
+    parser.add_argument('--flush-interval', type=int, default=0,
+                        help='CSV alle n Zeilen auf die Platte schreiben (0 = nur am Ende)')
+    parser.add_argument('--selective-load', action='store_true',
+                        help='Geometrie-Entities beim Laden auslassen (weniger Speicher, aber langsamer als das vollständige Laden)')
+    parser.add_argument('--lazy-load', action='store_true',
+                        help='Datei per mmap indizieren und Entities erst bei Bedarf lesen (sehr große Modelle)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Ergebnis-Cache für bereits geparste Modelle (z.B. tmp/ifc-data/cache)')
+    parser.add_argument('--state', default=None,
+                        help='Zustand der letzten Extraktion (JSON): nur geänderte/neue Elemente neu auswerten')
+    parser.add_argument('--delta', default=None,
+                        help='Änderungen gegenüber dem Zustand (Standard: <csv>-delta.csv)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Laufzeit je Stufe und IFC-Klasse sowie Cache-Treffer nach <csv>-stats.json schreiben')
+    parser.add_argument('--columnar', default=None,
+                        help='zusätzlich spaltenweise speichern: Datei .npz (numpy), .parquet oder .arrow (pyarrow)')
+    parser.add_argument('--geometry-quantities', action='store_true',
+                        help='fehlende Flächen/Volumen aus der triangulierten Geometrie berechnen (numpy)')
+    parser.add_argument('--mass', action='store_true',
+                        help='Gesamt- und Schichtmassen (kg) nach <csv>-mass.csv schreiben')
+    parser.add_argument('--layers', action='store_true',
+                        help='eine Zeile je Materialschicht (Dicke, Rohdichte, Fläche, Masse) nach <csv>-layers.csv')
+    args = parser.parse_args()
+    if args.columnar:
+        try:
+            check_format(args.columnar)
+        except ValueError as e:
+            parser.error(str(e))
 
+    parseIfc(args.ifc, args.csv, args.workers, args.flush_interval, args.selective_load, args.lazy_load,
+             args.cache_dir, args.state, args.delta, args.stats, args.columnar, args.geometry_quantities, args.mass,
+             args.layers)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# ----- Inkrementelle Extraktion ----- #
+# Bei einer neuen Revision eines Modells bleiben die meisten GlobalIds unverändert. Zu jeder
+# Extraktion wird daher ein Zustand gespeichert (JSON):
+#   {"version": ..., "products": {GUID: [Fingerabdruck, CSV-Zeile], ...}}
+# Der Fingerabdruck ist ein Hash über alles, was getInfos liest (Klasse, Attribute, Geschoss, System,
+# Typobjekt, Psets/Mengen, Material). Stimmt er mit dem Vorgänger überein, wird dessen CSV-Zeile
+# übernommen, sonst wird das Element neu ausgewertet. Zusätzlich entsteht eine Delta-Datei:
+#   Aenderung;<CSV-Spalten>   mit Aenderung = added / changed / removed
+
+import os
+import csv
+import json
+import hashlib
+from Instrumentation import record_cache, set_current_class
+
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+
+def stable_value(value):
+    # Entities (z.B. Einheiten) über ihren Inhalt statt über die Datei-Id -> vergleichbar zwischen Revisionen
+    if isinstance(value, (tuple, list)):
+        return tuple(stable_value(v) for v in value)
+    if hasattr(value, 'wrappedValue'):
+        return value.is_a(), stable_value(value.wrappedValue)
+    if hasattr(value, 'is_a'):
+        return (value.is_a(),) + tuple(stable_value(v) for v in value)
+    return value
+
+
+def stable_psets(psets):
+    return tuple((str(name), tuple((str(property_name), stable_value(value_unit))
+                                   for property_name, value_unit in sorted(properties.items(), key=lambda x: str(x[0]))))
+                 for name, properties in sorted(psets.items(), key=lambda x: str(x[0])))
+
+
+def fingerprint(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def load_state(filename):
+    try:
+        with open(filename, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(filename, version, products):
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'w', encoding='utf-8') as file:
+        json.dump({'version': version, 'products': products}, file)
+    os.replace(tmp_filename, filename)
+
+
+def incremental_rows(products, previous, version, state, delta, extract, product_fingerprint, reusable_product=None):
+    # products: (GUID, Entity); state/delta werden beim Durchlaufen gefüllt
+    # reusable_product: False für Elemente, deren Zeile trotz gleichem Fingerabdruck neu ermittelt werden muss
+    #                   (Delta dann nur bei geänderter Zeile)
+    previous_products = {}
+    reusable = False
+    if previous is not None:
+        previous_products = previous.get('products', {})
+        # andere Parser-Version oder Einheiten -> Zeilen nicht übernehmen, aber trotzdem vergleichen
+        reusable = previous.get('version') == version
+
+    for guid, p in products:
+        # Cache-Treffer des Fingerabdrucks (z.B. Material) der Klasse dieses Elements zurechnen;
+        # gezählt wird das Element erst in getInfos, wenn es neu ausgewertet wird
+        set_current_class(p.is_a())
+        digest = product_fingerprint(p)
+        old = previous_products.get(guid)
+        if reusable and old is not None and old[0] == digest and (reusable_product is None or reusable_product(p)):
+            record_cache('incremental', True)
+            row = old[1]
+        else:
+            record_cache('incremental', False)
+            row = extract(p)
+            if old is None:
+                delta.append((ADDED, row))
+            elif old[0] != digest or old[1] != row:
+                delta.append((CHANGED, row))
+        state[guid] = [digest, row]
+        yield row
+
+    for guid, (digest, row) in previous_products.items():
+        if guid not in state:
+            delta.append((REMOVED, row))
+
+
+def write_delta(filename, header, delta):
+    with open(filename, 'w', encoding='utf-8') as file:
+        writer = csv.writer(file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(['Aenderung'] + header)
+        for change, row in delta:
+            # nur die CSV-Spalten, ohne Zusatzfelder für Begleitdateien
+            writer.writerow([change] + list(row[:len(header)]))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# ----- Messwerte (optional) ----- #
+# Laufzeit und Aufrufe je Stufe von getInfos sowie Treffer der Caches, getrennt nach IFC-Klasse,
+# dazu die modellweiten Schritte (Laden, Indizes, Extraktion). Ausgeschaltet (Standard) kostet jede
+# Messstelle nur die Abfrage "_stats is None".
+#   _stats = {"classes": {IFC-Klasse: {"elements": n, "stages": {Stufe: [Aufrufe, Sekunden]},
+#                                      "caches": {Cache: [Treffer, Fehlschläge]}}},
+#             "model": {Schritt: Sekunden}}
+
+import json
+from time import perf_counter as timer
+
+_stats = None
+_current_class = None
+
+
+def enable_stats():
+    global _stats
+    _stats = {'classes': {}, 'model': {}}
+
+
+def disable_stats():
+    # liefert die gesammelten Werte
+    global _stats, _current_class
+    stats, _stats, _current_class = _stats, None, None
+    return stats
+
+
+def stats_enabled():
+    return _stats is not None
+
+
+def class_stats(ifc_class):
+    entry = _stats['classes'].get(ifc_class)
+    if entry is None:
+        entry = _stats['classes'][ifc_class] = {'elements': 0, 'stages': {}, 'caches': {}}
+    return entry
+
+
+def set_current_class(ifc_class):
+    # Klasse für die folgenden Cache-Treffer, ohne das Element zu zählen (z.B. Fingerabdruck vor getInfos)
+    global _current_class
+    _current_class = ifc_class
+
+
+def record_element(ifc_class):
+    set_current_class(ifc_class)
+    if _stats is not None:
+        class_stats(ifc_class)['elements'] += 1
+
+
+def record_stage(ifc_class, stage, seconds):
+    entry = class_stats(ifc_class)['stages'].setdefault(stage, [0, 0.0])
+    entry[0] += 1
+    entry[1] += seconds
+
+
+def record_cache(cache, hit):
+    # Treffer werden der Klasse des gerade ausgewerteten Elements zugerechnet, beim Aufbau der Indizes "(indexes)"
+    if _stats is None:
+        return
+    entry = class_stats(_current_class or '(indexes)')['caches'].setdefault(cache, [0, 0])
+    entry[0 if hit else 1] += 1
+
+
+def record_model_step(step, seconds):
+    if _stats is not None:
+        _stats['model'][step] = _stats['model'].get(step, 0.0) + seconds
+
+
+def merge_stats(stats):
+    # Werte eines Worker-Prozesses übernehmen
+    if _stats is None or not stats:
+        return
+    for ifc_class, other in stats['classes'].items():
+        entry = class_stats(ifc_class)
+        entry['elements'] += other['elements']
+        for group in ('stages', 'caches'):
+            for name, values in other[group].items():
+                target = entry[group].setdefault(name, [0] * len(values))
+                for i, value in enumerate(values):
+                    target[i] += value
+    for step, seconds in stats['model'].items():
+        record_model_step(step, seconds)
+
+
+def stats_report(stats, **summary):
+    classes = {}
+    totals = {}
+    for ifc_class, entry in sorted(stats['classes'].items()):
+        stages = {}
+        for stage, (calls, seconds) in entry['stages'].items():
+            stages[stage] = {'calls': calls, 'seconds': round(seconds, 6)}
+            total = totals.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+            total['calls'] += calls
+            total['seconds'] += seconds
+        caches = {}
+        for cache, (hits, misses) in entry['caches'].items():
+            caches[cache] = {'hits': hits, 'misses': misses,
+                             'hit_rate': round(hits / float(hits + misses), 4) if hits + misses else None}
+        classes[ifc_class] = {'elements': entry['elements'],
+                              'seconds': round(sum(s for c, s in entry['stages'].values()), 6),
+                              'stages': stages, 'caches': caches}
+
+    for total in totals.values():
+        total['seconds'] = round(total['seconds'], 6)
+    report = dict(summary)
+    report['model'] = dict((step, round(seconds, 6)) for step, seconds in stats['model'].items())
+    report['stages'] = totals
+    report['classes'] = classes
+    return report
+
+
+def write_stats(filename, report):
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=1, ensure_ascii=False)
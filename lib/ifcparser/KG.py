@@ -1,4 +1,8 @@
 # -*- coding: utf-8 -*-
+import os
+import csv
+from PropertyIndex import property_values
+from RelationIndex import system_of
 
 # ----- Referenzierungen ----- #
 referenceForExternalWall = "AW"
@@ -17,1667 +21,419 @@ referenceVentilation = "L_"
 referenceVentilation2 = "luft"
 referenceVentilation3 = "LUFT"
 
-
-def property_finder(ifc_element, property_set, property_name):
-    for s in ifc_element.IsDefinedBy:
-        if hasattr(s, 'RelatingPropertyDefinition'):
-            if s.RelatingPropertyDefinition.Name == property_set:
-                if hasattr(s.RelatingPropertyDefinition, 'HasProperties'):
-                    for v in s.RelatingPropertyDefinition.HasProperties:
-                        if v.Name == property_name:
-                            return v.NominalValue.wrappedValue
-                elif hasattr(s.RelatingPropertyDefinition, 'Quantities'):
-                    for v in s.RelatingPropertyDefinition.Quantities:
-                        if v.Name == property_name:
-                            for attr, value in vars(v).items():
-                                if attr.endswith('Value'):
-                                    return value
-    return None
+# Gruppen von Referenzen, die auf dasselbe Anlagensystem hinweisen
+wasteWater = (referenceWasteWater,)
+water = (referenceWater, referenceWater2)
+gas = (referenceGas,)
+heating = (referenceHeating,)
+cooling = (referenceCooling,)
+sprinkler = (referenceSprinkler,)
+rainWater = (referenceRainWater,)
+ventilation = (referenceVentilation, referenceVentilation2, referenceVentilation3)
 
 
 def distribution_system_finder(ifc_element):
-    for s in ifc_element.HasAssignments:
-        return s.RelatingGroup.ObjectType
-
-
-def getKG(self):
-    # ----- IfcBuildingElement: ----- #
-    # Balken / Unterzug:
-    def IfcBeam():
-        isExternal = property_finder(self.product, "Pset_BeamCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 333
-                # Außenstützen
-            elif not isExternal:
-                return 343
-                # Innenstützen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+    # Systemzuordnung aus dem Beziehungs-Index (IfcRelAssignsToGroup)
+    return system_of(ifc_element)
 
-    # Bauteil / Bauelement
-    def IfcBuildingElementProxy():
-        return 300
-        # Bauwerk Baukonstruktionen
 
-    # Schornstein
-    def IfcChimney():
-        return 399
-        # onstiges zur KG 390: Sonstige Maßnahmen für Baukonstruktionen
+# ----- Regeltabellen ----- #
+# Je IFC-Klasse: (Pset, Properties, Regeln). Die Properties werden einmal je Element aus dem Pset gelesen,
+# die Regeln (Bedingung, Kostengruppe) der Reihe nach geprüft - die erste zutreffende Bedingung liefert
+# die Kostengruppe. Trifft keine zu, ist die Kostengruppe None.
+# Bedingungen erhalten das eLCA_Produkt (enum, system, name) und die gelesenen Property-Werte.
 
-    # Stütze / Pfeiler
-    def IfcColumn():
-        isExternal = property_finder(self.product, "Pset_ColumnCommon", "IsExternal")
-        isLoadBearing = property_finder(self.product, "Pset_ColumnCommon", "LoadBearing")
-        reference = property_finder(self.product, "Pset_ColumnCommon", "Reference")
-        if isExternal is not None:
-            if isLoadBearing is not None:
-                if isExternal and isLoadBearing:
-                    return 333
-                    # Außenstützen
-                elif not isExternal and isLoadBearing:
-                    return 343
-                    # Innenstützen
-                elif not isExternal and not isLoadBearing:
-                    return 343
-                    # Innenstützen
-                elif isExternal and not isLoadBearing:
-                    return 335
-                    # Außenwandbekleidung Außen
-                    # = nichttragende Stützen, die zum Zweck der Bekleidung modelliert werden
-                elif not isExternal and not isLoadBearing and referenceRaisedFloor in reference:
-                    return 353
-                    # Deckenbeläge
-                    # = Stützen des Doppelbodensystems
-            elif isExternal:
-                return 330
-                # Außenwände/Vertikale Baukonstruktionen, außen
-            elif not isExternal:
-                return 340
-                # Innenwände/Vertikale Baukonstruktionen, innen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
-
-    # Bekleidung / Belag
-    # es handelt sich in diesem Fall um horizontale Bauteile. Vertikale Bekleidungen sollten in Revit
-    # mit dem Werzeug Wand modelliert werden und können nicht als IfcCoverung exportiert werden.
-    def IfcCovering():
-        isExternal = property_finder(self.product, "Pset_CoveringCommon", "IsExternal")
-        ''' TypeEnumeration:
-            CEILING
-            FLOORING
-            CLADDING
-            ROOFING
-            MOLDING
-            SKIRTINGBOARD
-            INSULATION
-            MEMBRANE
-            SLEEVING
-            WRAPPING
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == "CEILING":
-            return 354
-            # Deckenbekleidungen
-        elif self.enum == "ROOFING":
-            return 364
-            # Dachbekleidung
-        elif self.enum == "FLOORING":
-            return 353
-        if isExternal is not None:
-            if self.enum == "CLADDING" and isExternal:
-                return 335
-                # Außenwandbekleidung, außen
-            elif self.enum == "CLADDING" and not isExternal:
-                return 336
-                # Außenwandbekleidung, innen
-            elif self.enum == "MOLDING" and isExternal:
-                return 339
-                # Sonstiges zur KG 330: Außenwände/Vertikale Baukonstruktionen, außen
-            elif self.enum == "MOLDING" and not isExternal:
-                return 349
-                # Sonstiges zur KG 340: Innenwände/Vertikale Baukonstruktionen, innen
-            elif self.enum == "SKIRTINGBOARD" and not isExternal:
-                return 349
-                # Sonstiges zur KG 340: Innenwände/Vertikale Baukonstruktionen, innen
-            elif self.enum == "INSULATION" and isExternal:
-                return 325
-                # Abdichtungen und Bekleidungen der Gründung
-            elif self.enum == "INSULATION" and not isExternal:
-                return 354
-                # Deckenbekleidung
-            elif self.enum == "MEMBRANE" and isExternal:
-                return 325
-                # Abdichtungen und Bekleidungen der Gründung
-            elif self.enum == "MEMBRANE" and not isExternal:
-                return 354
-                # Deckenbekleidung
-            elif isExternal:
-                return 330
-                # Außenwände/Vertikale Baukonstruktionen, außen
-            elif not isExternal:
-                return 340
-                # Innenwände/Vertikale Baukonstruktionen, innen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+def always(e, v):
+    return True
 
-    # Vorhangfassade
-    def IfcCurtainWall():
-        isExternal = property_finder(self.product, "Pset_CurtainWallCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 337
-                # Elementierte Außenwandkonstruktionen
-            elif not isExternal:
-                return 346
-                # Elementierte Innenwandkonstruktionen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
 
-    # Tür
-    def IfcDoor():
-        isExternal = property_finder(self.product, "Pset_DoorCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 334
-                # Außenwandöffnungen
-            elif not isExternal:
-                return 344
-                # Innenwandöffnungen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+def constant(kg):
+    return None, (), ((always, kg),)
 
-    # Fundament
-    def IfcFooting():
-        return 322
-        # Flachgründungen und Bodenplatten
 
-    # Stab / Stabträger
-    def IfcMember():
-        isExternal = property_finder(self.product, "Pset_MemberCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 337
-                # Elementierte Außenwandkonstruktionen
-            elif not isExternal:
-                return 346
-                # Elementierte Innenwandkonstruktionen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+def isExternalRules(pset, external, internal):
+    # IsExternal nicht gesetzt -> 300 Bauwerk Baukonstruktionen
+    return pset, ("IsExternal",), (
+        (lambda e, v: v["IsExternal"] is None, 300),
+        (lambda e, v: v["IsExternal"], external),
+        (always, internal))
 
-    # Fundament / Tiefgründung
-    def IfcPile():
-        return 323
-        # Tiefgründungen
 
-    # Platte / Paneel
-    def IfcPlate():
-        isExternal = property_finder(self.product, "Pset_PlateCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 337
-                # Elementierte Außenwandkonstruktionen
-            elif not isExternal:
-                return 346
-                # Elementierte Innenwandkonstruktionen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+def inSystem(references):
+    return lambda e, v: any(reference in e.system for reference in references)
 
-    # Geländer
-    def IfcRailing():
-        isExternal = property_finder(self.product, "Pset_RailingCommon", "IsExternal")
-        if isExternal is not None:
-            if not isExternal:
-                return 359
-                # Sonstiges zur KG Decken/Horizontale Baukonstruktionen
-            elif isExternal:
-                return 369
-                # Sonstiges zur KG Dächer
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
 
-    # Rampe
-    def IfcRamp():
-        return 351
-        # Deckenkonstruktionen
+def systemRules(conditions, otherwise=400, noSystem=000):
+    # Zuordnung über die Referenz im Namen des Verteilsystems (ObjectType)
+    return (((lambda e, v: e.system is None, noSystem),)
+            + tuple((inSystem(references), kg) for references, kg in conditions)
+            + ((always, otherwise),))
 
-    # Rampenlauf
-    def IfcRampFlight():
-        return 351
-        # Deckenkonstruktionen
 
-    # Dach
-    def IfcRoof():
-        isLoadBearing = property_finder(self.product, "Pset_RoofCommon", "LoadBearing")
-        if isLoadBearing is not None:
-            if isLoadBearing:
-                return 361
-                # Dachkonstuktionen
-            elif not isLoadBearing:
-                return 363
-                # Dachbeläge
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
+def enumRules(kgByEnum, otherwise=400):
+    return None, (), (tuple((lambda e, v, enum=enum: e.enum == enum, kg) for enum, kg in kgByEnum)
+                      + ((always, otherwise),))
 
-    # Sonnenschutz
-    def IfcShadingDevice():
-        isExternal = property_finder(self.product, "Pset_ShadingDeviceCommon", "IsExternal")
-        if isExternal is not None:
-            if isExternal:
-                return 338
-                # Lichtschutz zur KG 330: Außenwände/Vertikale Baukonstruktionen, außen
-            elif not isExternal:
-                return 347
-                # Lichtschutz zur KG 340: Innenwände/Vertikale Baukonstruktionen, innen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
 
+kgRules = {
+    # ----- IfcBuildingElement: ----- #
+    # Balken / Unterzug: Außenstützen / Innenstützen
+    "IfcBeam": isExternalRules("Pset_BeamCommon", 333, 343),
+    # Bauteil / Bauelement: Bauwerk Baukonstruktionen
+    "IfcBuildingElementProxy": constant(300),
+    # Schornstein: Sonstiges zur KG 390: Sonstige Maßnahmen für Baukonstruktionen
+    "IfcChimney": constant(399),
+    # Stütze / Pfeiler
+    "IfcColumn": ("Pset_ColumnCommon", ("IsExternal", "LoadBearing"), (
+        (lambda e, v: v["IsExternal"] is None, 300),
+        # ohne LoadBearing: Außenwände / Innenwände (Vertikale Baukonstruktionen)
+        (lambda e, v: v["LoadBearing"] is None and v["IsExternal"], 330),
+        (lambda e, v: v["LoadBearing"] is None, 340),
+        # Außenstützen
+        (lambda e, v: v["IsExternal"] and v["LoadBearing"], 333),
+        # Innenstützen
+        (lambda e, v: not v["IsExternal"], 343),
+        # Außenwandbekleidung Außen = nichttragende Stützen, die zum Zweck der Bekleidung modelliert werden
+        (always, 335))),
+    # Bekleidung / Belag
+    # es handelt sich in diesem Fall um horizontale Bauteile. Vertikale Bekleidungen sollten in Revit
+    # mit dem Werzeug Wand modelliert werden und können nicht als IfcCoverung exportiert werden.
+    # TypeEnumeration: CEILING, FLOORING, CLADDING, ROOFING, MOLDING, SKIRTINGBOARD, INSULATION, MEMBRANE,
+    #                  SLEEVING, WRAPPING, USERDEFINED, NOTDEFINED
+    "IfcCovering": ("Pset_CoveringCommon", ("IsExternal",), (
+        (lambda e, v: e.enum == "CEILING", 354),  # Deckenbekleidungen
+        (lambda e, v: e.enum == "ROOFING", 364),  # Dachbekleidung
+        (lambda e, v: e.enum == "FLOORING", 353),
+        (lambda e, v: v["IsExternal"] is None, 300),
+        (lambda e, v: e.enum == "CLADDING" and v["IsExternal"], 335),  # Außenwandbekleidung, außen
+        (lambda e, v: e.enum == "CLADDING", 336),  # Außenwandbekleidung, innen
+        (lambda e, v: e.enum == "MOLDING" and v["IsExternal"], 339),  # Sonstiges zur KG 330
+        (lambda e, v: e.enum == "MOLDING", 349),  # Sonstiges zur KG 340
+        (lambda e, v: e.enum == "SKIRTINGBOARD" and not v["IsExternal"], 349),  # Sonstiges zur KG 340
+        (lambda e, v: e.enum == "INSULATION" and v["IsExternal"], 325),  # Abdichtungen und Bekleidungen der Gründung
+        (lambda e, v: e.enum == "INSULATION", 354),  # Deckenbekleidung
+        (lambda e, v: e.enum == "MEMBRANE" and v["IsExternal"], 325),  # Abdichtungen und Bekleidungen der Gründung
+        (lambda e, v: e.enum == "MEMBRANE", 354),  # Deckenbekleidung
+        (lambda e, v: v["IsExternal"], 330),  # Außenwände/Vertikale Baukonstruktionen, außen
+        (always, 340))),  # Innenwände/Vertikale Baukonstruktionen, innen
+    # Vorhangfassade: Elementierte Außenwandkonstruktionen / Elementierte Innenwandkonstruktionen
+    "IfcCurtainWall": isExternalRules("Pset_CurtainWallCommon", 337, 346),
+    # Tür: Außenwandöffnungen / Innenwandöffnungen
+    "IfcDoor": isExternalRules("Pset_DoorCommon", 334, 344),
+    # Fundament: Flachgründungen und Bodenplatten
+    "IfcFooting": constant(322),
+    # Stab / Stabträger: Elementierte Außenwandkonstruktionen / Elementierte Innenwandkonstruktionen
+    "IfcMember": isExternalRules("Pset_MemberCommon", 337, 346),
+    # Fundament / Tiefgründung: Tiefgründungen
+    "IfcPile": constant(323),
+    # Platte / Paneel: Elementierte Außenwandkonstruktionen / Elementierte Innenwandkonstruktionen
+    "IfcPlate": isExternalRules("Pset_PlateCommon", 337, 346),
+    # Geländer: Sonstiges zur KG Dächer / Sonstiges zur KG Decken/Horizontale Baukonstruktionen
+    "IfcRailing": isExternalRules("Pset_RailingCommon", 369, 359),
+    # Rampe, Rampenlauf: Deckenkonstruktionen
+    "IfcRamp": constant(351),
+    "IfcRampFlight": constant(351),
+    # Dach: Dachkonstuktionen / Dachbeläge
+    "IfcRoof": ("Pset_RoofCommon", ("LoadBearing",), (
+        (lambda e, v: v["LoadBearing"] is None, 300),
+        (lambda e, v: v["LoadBearing"], 361),
+        (always, 363))),
+    # Sonnenschutz: Lichtschutz zur KG 330 / Lichtschutz zur KG 340
+    "IfcShadingDevice": isExternalRules("Pset_ShadingDeviceCommon", 338, 347),
     # Decke / Dachfläche / Bodenplatte
-    def IfcSlab():
-        isExternal = property_finder(self.product, "Pset_SlabCommon", "IsExternal")
-        isLoadBearing = property_finder(self.product, "Pset_SlabCommon", "LoadBearing")
-        ''' TypeEnumeration:
-            FLOOR
-            ROOF
-            LANDING
-            BASESLAB
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == "BASESLAB":
-            return 322
-            # Flachgründungen und Bodenplatten
-        elif self.enum == "LANDING":
-            return 351
-            # Dachkonstruktionen
-        elif isLoadBearing is not None:
-            if self.enum == "ROOF" and isLoadBearing:
-                return 361
-                # Dachkonstruktionen
-            elif self.enum == "ROOF" and not isLoadBearing:
-                return 363
-                # Dachbeläge
-            elif isExternal is not None:
-                if self.enum == "FLOOR" or (isLoadBearing and not isExternal):
-                    return 351
-                    # Deckenkonstruktionen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
-
-    # Treppe
-    def IfcStair():
-        return 351
-        # Dachkonstruktionen
-
-    # Treppenlauf
-    def IfcStairFlight():
-        return 351
-        # Dachkonstruktionen
-
-    # Wand
-    def IfcWall():
-        reference = property_finder(self.product, "Pset_WallCommon", "Reference")
-        isExternal = property_finder(self.product, "Pset_WallCommon", "IsExternal")
-        isLoadBearing = property_finder(self.product, "Pset_WallCommon", "LoadBearing")
-        isExtendToStructure = property_finder(self.product, "Pset_WallCommon", "ExtendToStructure")
-        if isExternal is not None:
-            if isLoadBearing is not None:
-                if isExtendToStructure is not None:
-                    if isLoadBearing and isExternal and not isExtendToStructure:
-                        return 331
-                        # Tragende Außenwände
-                    elif not isLoadBearing and isExternal and not isExtendToStructure:
-                        return 332
-                        # Nichttragende Außenwände
-                    elif not isLoadBearing and isExternal and isExtendToStructure:
-                        return 335
-                        # Außenwandbekleidung, außen
-                    elif not isLoadBearing and not isExternal and (isExtendToStructure and referenceForExternalWall in reference):
-                        return 336
-                        # Außenwandbekleidung, innen
-                    elif isLoadBearing and not isExternal and not isExtendToStructure:
-                        return 341
-                        # Tragende Innenwände
-                    elif not isLoadBearing and not isExternal and not isExtendToStructure:
-                        return 342
-                        # Nichttragende Innenwände
-                    elif not isLoadBearing and not isExternal and (isExtendToStructure and referenceForInternalWall in reference):
-                        return 345
-                        # Innenwandbekleidung
-                    elif not isLoadBearing and not isExternal and isExtendToStructure:
-                        return 000
-            elif isExternal:
-                return 330
-                # Außenwände/Vertikale Baukonstruktionen, außen
-            elif not isExternal:
-                return 340
-                # Innenwände/Vertikale Baukonstruktionen, innen
-        else:
-            return 300
-            # Bauwerk Baukonstruktionen
-
+    # TypeEnumeration: FLOOR, ROOF, LANDING, BASESLAB, USERDEFINED, NOTDEFINED
+    "IfcSlab": ("Pset_SlabCommon", ("IsExternal", "LoadBearing"), (
+        (lambda e, v: e.enum == "BASESLAB", 322),  # Flachgründungen und Bodenplatten
+        (lambda e, v: e.enum == "LANDING", 351),
+        (lambda e, v: v["LoadBearing"] is None, 300),
+        (lambda e, v: e.enum == "ROOF" and v["LoadBearing"], 361),  # Dachkonstruktionen
+        (lambda e, v: e.enum == "ROOF", 363),  # Dachbeläge
+        (lambda e, v: v["IsExternal"] is not None and (
+            e.enum == "FLOOR" or (v["LoadBearing"] and not v["IsExternal"])), 351))),  # Deckenkonstruktionen
+    # Treppe, Treppenlauf
+    "IfcStair": constant(351),
+    "IfcStairFlight": constant(351),
     # Fenster
-    def IfcWindow():
-        isExternal = property_finder(self.product, "Pset_WindowCommon", "IsExternal")
-        ''' TypeEnumeration:
-            WINDOW
-            SKYLIGHT
-            LIGHTDOME
-            USERDEFINED
-            NOTDEFINED            
-        '''
-        if isExternal is not None:
-            if self.enum == "LIGHTDOME" and isExternal:
-                return 362
-                # Dachöffnungen
-            elif self.enum == "SKYLIGHT" and isExternal:
-                return 362
-                # Dachöffnungen
-            elif isExternal:
-                return 334
-                # Außenwandöffnungen
-            elif not isExternal:
-                return 344
-                # Innenwandöffnungen
-        else:
-            return 300
+    # TypeEnumeration: WINDOW, SKYLIGHT, LIGHTDOME, USERDEFINED, NOTDEFINED
+    "IfcWindow": ("Pset_WindowCommon", ("IsExternal",), (
+        (lambda e, v: v["IsExternal"] is None, 300),
+        (lambda e, v: e.enum == "LIGHTDOME" and v["IsExternal"], 362),  # Dachöffnungen
+        (lambda e, v: e.enum == "SKYLIGHT" and v["IsExternal"], 362),  # Dachöffnungen
+        (lambda e, v: v["IsExternal"], 334),  # Außenwandöffnungen
+        (always, 344))),  # Innenwandöffnungen
 
     # ----- IfcDistributionControlElement: ----- #
-    # Aktor:
-    def IfcActuator():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Alarm / Gefahrenmelder
-    def IfcAlarm():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Regler
-    def IfcController():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Messinstrument
-    def IfcFlowInstrument():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Sicherungsschalter
-    def IfcProtectiveDeviceTrippingUnit():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Sensor
-    def IfcSensor():
-        return 480
-        # Gebäude- und Anlagenautomation
-
-    # Einheitsregler
-    def IfcUnitaryControlElement():
-        return 480
-        # Gebäude- und Anlagenautomation
+    # Aktor, Alarm / Gefahrenmelder, Regler, Messinstrument, Sicherungsschalter, Sensor, Einheitsregler:
+    # Gebäude- und Anlagenautomation
+    "IfcActuator": constant(480),
+    "IfcAlarm": constant(480),
+    "IfcController": constant(480),
+    "IfcFlowInstrument": constant(480),
+    "IfcProtectiveDeviceTrippingUnit": constant(480),
+    "IfcSensor": constant(480),
+    "IfcUnitaryControlElement": constant(480),
 
     # ----- IfcDistributionFlowElement: ----- #
-    # Schacht / Graben / Revisionsschacht:
-    def IfcDistributionChamberElement():
-        return 399
-        # Sonstiges zur KG 390: Sonstige Maßnahmen für Baukonstruktionen
+    # Schacht / Graben / Revisionsschacht: Sonstiges zur KG 390
+    "IfcDistributionChamberElement": constant(399),
 
     # ----- IfcEnergyConversionDevice: ----- #
-    # Wärmerückgewinner:
-    def IfcAirToAirHeatRecovery():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Heizkessel
-    def IfcBoiler():
-        return 421
-        # Wärmeerzeugungsanlagen
-
-    # Brenner
-    def IfcBurner():
-        return 421
-        # Wärmeerzeugungsanlagen
-
-    # Kältemaschine
-    def IfcChiller():
-        return 434
-        # Költeanlagen
-
+    # Wärmerückgewinner: Raumlufttechnische Anlagen
+    "IfcAirToAirHeatRecovery": constant(430),
+    # Heizkessel, Brenner: Wärmeerzeugungsanlagen
+    "IfcBoiler": constant(421),
+    "IfcBurner": constant(421),
+    # Kältemaschine: Kälteanlagen
+    "IfcChiller": constant(434),
     # Heiz-Kühlelemente
-    def IfcCoil():
-        if self.system is not None:
-            if referenceHeating in self.system:
-                return 421
-                # Wärmeerzeugungsanlagen
-            elif referenceVentilation in self.system or referenceVentilation2 in self.system or referenceVentilation3 in self.system:
-                return 430
-                # Raumlufttechnische Analgen
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
+    "IfcCoil": (None, (), systemRules(((heating, 421), (ventilation, 430), (cooling, 434)))),
     # Kondensator
-    def IfcCondenser():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
-    # Kühlbalken
-    def IfcCooledBeam():
-        return 434
-        # Kälteanlagen
-
-    # Kühlturm
-    def IfcCoolingTower():
-        return 434
-        # Kälteanlagen
-
-    # Elektrogenerator
-    def IfcElectricGenerator():
-        return 442
-        # Eigenstromversorgungsanlagen
-
-    # Elektromotor
-    def IfcElectricMotor():
-        return 400
-        # Bauwerk — Technische Anlagen
-
-    # Motor
-    def IfcEngine():
-        return 400
-        # Bauwerk — Technische Anlagen
-
-    # Verdunstungskühler
-    def IfcEvaporativeCooler():
-        return 434
-        # Kälteanlagen
-
+    "IfcCondenser": (None, (), systemRules(((wasteWater, 411), (water, 412), (heating, 422), (cooling, 434),
+                                            (sprinkler, 474)))),
+    # Kühlbalken, Kühlturm: Kälteanlagen
+    "IfcCooledBeam": constant(434),
+    "IfcCoolingTower": constant(434),
+    # Elektrogenerator: Eigenstromversorgungsanlagen
+    "IfcElectricGenerator": constant(442),
+    # Elektromotor, Motor: Bauwerk — Technische Anlagen
+    "IfcElectricMotor": constant(400),
+    "IfcMotor": constant(400),
+    # Verdunstungskühler: Kälteanlagen
+    "IfcEvaporativeCooler": constant(434),
     # Verdampfer
-    def IfcEvaporator():
-        if self.system is not None:
-            if referenceVentilation in self.system or referenceVentilation2 in self.system or referenceVentilation3 in self.system:
-                return 430
-                # Raumlufttechnische Anlage
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
+    "IfcEvaporator": (None, (), systemRules(((ventilation, 430),))),
     # Wärmetauscher
-    def IfcHeatExchanger():
-        if self.system is not None:
-            if referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceVentilation in self.system or referenceVentilation2 in self.system or referenceVentilation3 in self.system:
-                return 430
-                # Raumlufttechnische Anlagen
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
-    # Befeuchter
-    def IfcHumidifier():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Motoranschluss
-    def IfcMotorConnection():
-        return 400
-        # Bauwerk — Technische Anlagen
-
-    # Solargerät
-    def IfcSolarDevice():
-        ''' TypeEnumeration
-            SOLARCOLLECTOR
-            SOLARPANEL
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == "SOLARCOLLECTOR":
-            return 421
-            # Wärmeerzeugungsanlagen
-        elif self.enum == "SOLARPANEL":
-            return 442
-            # Eigenstromversorgungsanlagen
-        else:
-            return 400
-            # Bauwerk — Technische Anlagen
-
-    # Transformator
-    def IfcTransformer():
-        return 441
-        # Hoch- und Mittelspannungsanlagen
-
-    # Rohrbündel
-    def IfcTubeBundle():
-        return 400
-        # Bauwerk — Technische Anlagen
-
-    # Einbaufertige Anlage
-    def IfcUnitaryEquipment():
-        ''' TypeЕnumeration
-            AIRHANDLER
-            AIRCONDITIONINGUNIT
-            DEHUMIDIFIER
-            SPLITSYSTEM
-            ROOFTOPUNIT
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == "AIRHANDLER":
-            return 431
-            # Lüftungsanlagen
-        elif self.enum == "AIRCONDITIONINGUNIT":
-            return 432
-            # Teilklimaanlagen
-        elif self.enum == "DEHUMIDIFIER":
-            return 430
-            # Raumlufttechnische Anlagen
-        elif self.enum == "ROOFTOPUNIT":
-            return 433
-            # Klimaanlagen
-        else:
-            return 400
-            # Bauwerk — Technische Anlagen
+    "IfcHeatExchanger": (None, (), systemRules(((heating, 422), (ventilation, 430), (cooling, 434)))),
+    # Befeuchter: Raumlufttechnische Anlagen
+    "IfcHumidifier": constant(430),
+    # Motoranschluss: Bauwerk — Technische Anlagen
+    "IfcMotorConnection": constant(400),
+    # Solargerät: Wärmeerzeugungsanlagen / Eigenstromversorgungsanlagen
+    # TypeEnumeration: SOLARCOLLECTOR, SOLARPANEL, USERDEFINED, NOTDEFINED
+    "IfcSolarDevice": enumRules((("SOLARCOLLECTOR", 421), ("SOLARPANEL", 442))),
+    # Transformator: Hoch- und Mittelspannungsanlagen
+    "IfcTransformer": constant(441),
+    # Rohrbündel: Bauwerk — Technische Anlagen
+    "IfcTubeBundle": constant(400),
+    # Einbaufertige Anlage: Lüftungsanlagen / Teilklimaanlagen / Raumlufttechnische Anlagen / Klimaanlagen
+    # TypeEnumeration: AIRHANDLER, AIRCONDITIONINGUNIT, DEHUMIDIFIER, SPLITSYSTEM, ROOFTOPUNIT, USERDEFINED, NOTDEFINED
+    "IfcUnitaryEquipment": enumRules((("AIRHANDLER", 431), ("AIRCONDITIONINGUNIT", 432), ("DEHUMIDIFIER", 430),
+                                      ("ROOFTOPUNIT", 433))),
 
     # ----- IfcFlowController: ----- #
-    # Volumenstromregler
-    def IfcAirTerminalBox():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Regelklappe
-    def IfcDamper():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Elektrischer Verteilungsregler
-    def IfcElectricDistributionBoard():
-        return 440
-        # Elektrische Anlagen
-
-    # Elektronische Zeitsteuerung
-    def IfcElectricTimeControl():
-        return 452
-        # Zeitdienstanlagen
-
+    # Volumenstromregler, Regelklappe: Raumlufttechnische Anlagen
+    "IfcAirTerminalBox": constant(430),
+    "IfcDamper": constant(430),
+    # Elektrischer Verteilungsregler: Elektrische Anlagen
+    "IfcElectricDistributionBoard": constant(440),
+    # Elektronische Zeitsteuerung: Zeitdienstanlagen
+    "IfcElectricTimeControl": constant(452),
     # Zähler
-    def IfcFlowMeter():
-        if self.system is not None:
-            if referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
-    # Sicherung
-    def IfcProtectiveDevice():
-        return 440
-        # Elektrische Anlagen
-
-    # Schalter
-    def IfcSwitchingDevice():
-        return 440
-        # Elektrische Anlagen
-
+    "IfcFlowMeter": (None, (), systemRules(((water, 412), (gas, 413), (heating, 422), (cooling, 434)))),
+    # Sicherung, Schalter: Elektrische Anlagen
+    "IfcProtectiveDevice": constant(440),
+    "IfcSwitchingDevice": constant(440),
     # Ventil
-    def IfcValve():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            elif referenceRainWater in self.system:
-                return 369
-                # Sonstiges zur KG 360
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
+    "IfcValve": (None, (), systemRules(((wasteWater, 411), (water, 412), (gas, 413), (heating, 422), (cooling, 434),
+                                        (sprinkler, 474), (rainWater, 369)))),
 
     # ----- IfcFlowFitting: ----- #
-    # Kabelträger Passstück:
-    def IfcCableCarrierFitting():
-        return 440
-        # Elektrische Anlagen
-
-    # Kabelverbinder
-    def IfcCableFitting():
-        return 440
-        # Elektrische Anlagen
-
-    # Kanalverbinder
-    def IfcDuctFitting():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Verbindungsdose
-    def IfcJunctionBox():
-        return 440
-        # Elektrische Anlagen
-
+    # Kabelträger Passstück, Kabelverbinder: Elektrische Anlagen
+    "IfcCableCarrierFitting": constant(440),
+    "IfcCableFitting": constant(440),
+    # Kanalverbinder: Raumlufttechnische Anlagen
+    "IfcDuctFitting": constant(430),
+    # Verbindungsdose: Elektrische Anlagen
+    "IfcJunctionBox": constant(440),
     # Rohrverbinder
-    def IfcPipeFitting():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            elif referenceRainWater in self.system:
-                return 369
-                # Sonstiges zur KG 360
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
+    "IfcPipeFitting": (None, (), systemRules(((wasteWater, 411), (water, 412), (gas, 413), (heating, 422),
+                                              (cooling, 434), (sprinkler, 474), (rainWater, 369)))),
 
     # ----- IfcFlowMovingDevice: ----- #
-    # Kompressor:
-    def IfcCompressor():
-        return 434
-        # Kälteanlagen
-
-    # Ventilator
-    def IfcFan():
-        return 430
-        # Raumlufttechnische Anlgen
-
+    # Kompressor: Kälteanlagen
+    "IfcCompressor": constant(434),
+    # Ventilator: Raumlufttechnische Anlagen
+    "IfcFan": constant(430),
     # Pumpe
-    def IfcPump():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
+    "IfcPump": (None, (), systemRules(((wasteWater, 411), (water, 412), (gas, 413), (heating, 422), (cooling, 434),
+                                       (sprinkler, 474)))),
 
     # ----- IfcFlowSegment: ----- #
-    def IfcFlowSegment():
-        if referenceForGutter in self.name:
-            return 369
-            # Sonstiges zur KG 360
-        else:
-            return 400
-
-    # Kabelträgersegment:
-    def IfcCableCarrierSegment():
-        return 440
-        # Elektrische Anlagen
-
-    # Kabelsegment
-    def IfcCableSegment():
-        return 440
-        # Elektrische Anlagen
-
-    # Kanalsegment
-    def IfcDuctSegment():
-        return 430
-        # Raumlufttechnische Anlagen
-
+    # Dachrinne: Sonstiges zur KG 360
+    "IfcFlowSegment": (None, (), (
+        (lambda e, v: referenceForGutter in e.name, 369),
+        (always, 400))),
+    # Kabelträgersegment, Kabelsegment: Elektrische Anlagen
+    "IfcCableCarrierSegment": constant(440),
+    "IfcCableSegment": constant(440),
+    # Kanalsegment: Raumlufttechnische Anlagen
+    "IfcDuctSegment": constant(430),
     # Rohr
-    def IfcPipeSegment():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            elif referenceRainWater in self.system:
-                return 369
-                # Sonstiges zur KG 360
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
+    "IfcPipeSegment": (None, (), systemRules(((wasteWater, 411), (water, 412), (gas, 413), (heating, 422),
+                                              (cooling, 434), (sprinkler, 474), (rainWater, 369)))),
     # Tank
-    def IfcTank():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceGas in self.system:
-                return 413
-                # Gasanlagen
-            elif referenceHeating in self.system:
-                return 422
-                # Wärmeverteilnetze
-            elif referenceCooling in self.system:
-                return 434
-                # Kälteanlagen
-            elif referenceSprinkler in self.system:
-                return 474
-                # Feuerlöschanlagen
-            elif referenceRainWater in self.system:
-                return 412
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
+    "IfcTank": (None, (), systemRules(((wasteWater, 411), (water, 412), (gas, 413), (heating, 422), (cooling, 434),
+                                       (sprinkler, 474), (rainWater, 412)))),
 
     # ----- IfcFlowTerminal: ----- #
-    # Luftauslass:
-    def IfcAirTerminal():
-        return 430
-        # Raumlufttechnische Anlagen
-
-    # Audiovisuelles Gerät
-    def IfcAudioVisualAppliance():
-        return 630
-        # Informationstechnische Ausstattung
-
-    # Kommunikationgerät
-    def IfcCommunicationsAppliance():
-        return 451
-        # Telekekommunikationsanlagen
-
-    # Elektisches Gerät
-    def IfcElectricAppliance():
-        ''' TypeEnumeration
-            DISHWASHER
-            ELECTRICCOOKER
-            FREESTANDINGELECTRICHEATER
-            FREESTANDINGFAN
-            FREESTANDINGWATERHEATER
-            FREESTANDINGWATERCOOLER
-            FREEZER
-            FRIDGE_FREEZER
-            HANDDRYER
-            KITCHENMACHINE
-            MICROWAVE
-            PHOTOCOPIER
-            REFRIGERATOR
-            TUMBLEDRYER
-            VENDINGMACHINE
-            WASHINGMACHINE
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == ("DISHWASHER"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("ELECTRICCOOKER"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("FREESTANDINGELECTRICHEATER"):
-            self.KG = 421
-            # Wärmeerzeugungsanlagen
-        elif self.enum == ("FREESTANDINGFAN"):
-            self.KG = 431
-            # Lüftungsanlagen
-        elif self.enum == ("FREESTANDINGWATERHEATER"):
-            self.KG = 421
-            # Wärmeerzeugungsanlagen
-        elif self.enum == ("FREESTANDINGWATERCOOLER"):
-            self.KG = 434
-            # Kälteanlagen
-        elif self.enum == ("FREEZER"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("FRIDGE_FREEZER"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("HANDDRYER"):
-            self.KG = 412
-            # Wasseranlagen
-        elif self.enum == ("KITCHENMACHINE"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("MICROWAVE"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("PHOTOCOPIER"):
-            self.KG = 630
-            # Informationstechnische Ausstattung
-        elif self.enum == ("REFRIGERATOR"):
-            self.KG = 471
-        elif self.enum == ("TUMBLEDRYER"):
-            self.KG = 412
-            # Wasseranlagen
-        elif self.enum == ("VENDINGMACHINE"):
-            self.KG = 471
-            # Küchentechnische Anlagen
-        elif self.enum == ("WASHINGMACHINE"):
-            self.KG = 412
-            # Wasseranlagen
-        else:
-            return 400
-            # Bauwerk — Technische Anlagen
-
-    # Feuerlöscheinrichtung
-    def IfcFireSuppressionTerminal():
-        return 474
-        # Feuerlöschanlagen
-
-    # Lampe/Leuchtmittel
-    def IfcLamp():
-        return 445
-        # Beleuchtungsanlagen
-
-    # Leuchte
-    def IfcLightFixture():
-        return 445
-        # Beleuchtungsmittel
-
-    # Medizinisches Gerät
-    def IfcMedicalDevice():
-        return 620
-        # Besondere Ausstattung
-
-    # Dose/Steckdose
-    def IfcOutlet():
-        return 440
-        # Elektrische Anlagen
-
-    # Sanitäreinrichtung
-    def IfcSanitaryTerminal():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-        else:
-            return 410
-            # Abwasser-, Wasser-, Gasanlagen
-
-    # Heizkörper
-    def IfcSpaceHeater():
-        return 423
-        # Raumheizflächen
-
-    # Rohrabdeckung
-    def IfcStackTerminal():
-        return 412
-        # Wasseranlagen
-
+    # Luftauslass: Raumlufttechnische Anlagen
+    "IfcAirTerminal": constant(430),
+    # Audiovisuelles Gerät: Informationstechnische Ausstattung
+    "IfcAudioVisualAppliance": constant(630),
+    # Kommunikationgerät: Telekommunikationsanlagen
+    "IfcCommunicationsAppliance": constant(451),
+    # Elektisches Gerät: Küchentechnische Anlagen / Wärmeerzeugungsanlagen / Lüftungsanlagen / Kälteanlagen /
+    #                    Wasseranlagen / Informationstechnische Ausstattung
+    "IfcElectricAppliance": enumRules((("DISHWASHER", 471), ("ELECTRICCOOKER", 471),
+                                       ("FREESTANDINGELECTRICHEATER", 421), ("FREESTANDINGFAN", 431),
+                                       ("FREESTANDINGWATERHEATER", 421), ("FREESTANDINGWATERCOOLER", 434),
+                                       ("FREEZER", 471), ("FRIDGE_FREEZER", 471), ("HANDDRYER", 412),
+                                       ("KITCHENMACHINE", 471), ("MICROWAVE", 471), ("PHOTOCOPIER", 630),
+                                       ("REFRIGERATOR", 471), ("TUMBLEDRYER", 412), ("VENDINGMACHINE", 471),
+                                       ("WASHINGMACHINE", 412))),
+    # Feuerlöscheinrichtung: Feuerlöschanlagen
+    "IfcFireSuppressionTerminal": constant(474),
+    # Lampe/Leuchtmittel, Leuchte: Beleuchtungsanlagen
+    "IfcLamp": constant(445),
+    "IfcLightFixture": constant(445),
+    # Medizinisches Gerät: Besondere Ausstattung
+    "IfcMedicalDevice": constant(620),
+    # Dose/Steckdose: Elektrische Anlagen
+    "IfcOutlet": constant(440),
+    # Sanitäreinrichtung: ohne System 410 Abwasser-, Wasser-, Gasanlagen
+    "IfcSanitaryTerminal": (None, (), (
+        (lambda e, v: e.system is None, 410),
+        (inSystem(wasteWater), 411),
+        (inSystem(water), 412))),
+    # Heizkörper: Raumheizflächen
+    "IfcSpaceHeater": constant(423),
+    # Rohrabdeckung: Wasseranlagen
+    "IfcStackTerminal": constant(412),
     # Ablauf / Abscheider
-    def IfcWasteTerminal():
-        if self.system is not None:
-            if referenceWasteWater in self.system:
-                return 411
-                # Abwasseranlagen
-            elif referenceWater in self.system or referenceWater2 in self.system:
-                return 412
-                # Wasseranlagen
-            elif referenceRainWater in self.system:
-                return 369
-                # Sonstiges zur KG 360
-            else:
-                return 400
-                # Bauwerk — Technische Anlagen
-        else:
-            return 000
-
-    # ----- IfcFlowTerminal: ----- #
-    # Endgerät
-    def IfcFlowTerminal():
-        return 412
-        # Wasseranlagen
-
-    # Kanalschalldämpfer:
-    def IfcDuctSilencer():
-        return 430
-        # Raumlufttechnische Anlagen
-
+    "IfcWasteTerminal": (None, (), systemRules(((wasteWater, 411), (water, 412), (rainWater, 369)))),
+    # Endgerät: Wasseranlagen
+    "IfcFlowTerminal": constant(412),
+    # Kanalschalldämpfer: Raumlufttechnische Anlagen
+    "IfcDuctSilencer": constant(430),
     # Filter
-    def IfcFilter():
-        ''' TypeEnumeration
-            AIRPARTICLEFILTER
-            COMPRESSEDAIRFILTER
-            ODORFILTER
-            OILFILTER
-            STRAINER
-            WATERFILTER
-            USERDEFINED
-            NOTDEFINED
-        '''
-        if self.enum == "AIRPARTICLEFILTER":
-            return 430
-            # Raumlufttechnische Anlagen
-        elif self.enum == "COMPRESSEDAIRFILTER":
-            return 430
-            # Raumlufttechnische Anlagen
-        elif self.enum == "ODORFILTER":
-            return 430
-            # Raumlufttechnische Anlagen
-        elif self.enum == "OILFILTER":
-            return 400
-            # Bauwerk — Technische Anlagen
-        elif self.enum == "STRAINER":
-            if self.system is not None:
-                if referenceWasteWater in self.system:
-                    return 411
-                    # Abwasseranlagen
-                elif referenceWater in self.system or referenceWater2 in self.system:
-                    return 412
-                    # Wasseranlagen
-                elif referenceGas in self.system:
-                    return 413
-                    # Gasanlagen
-                elif referenceRainWater in self.system:
-                    return 369
-                    # Sonstiges zur KG 360
-                else:
-                    return 410
-                # Abwasser-, Wasser-, Gasanlagen
-            else:
-                return 000
-        elif self.enum == "WATERFILTER":
-            return 412
-            # Wasseranlagen
-        else:
-            return 400
-            # Bauwerk — Technische Anlagen
-
-    # Abscheider
-    def IfcInterceptor():
-        return 400
-        # Bauwerk — Technische Anlagen
+    # TypeEnumeration: AIRPARTICLEFILTER, COMPRESSEDAIRFILTER, ODORFILTER, OILFILTER, STRAINER, WATERFILTER,
+    #                  USERDEFINED, NOTDEFINED
+    "IfcFilter": (None, (), (
+        (lambda e, v: e.enum in ("AIRPARTICLEFILTER", "COMPRESSEDAIRFILTER", "ODORFILTER"), 430),
+        (lambda e, v: e.enum == "OILFILTER", 400),
+        (lambda e, v: e.enum == "STRAINER" and e.system is None, 000),
+        (lambda e, v: e.enum == "STRAINER" and inSystem(wasteWater)(e, v), 411),
+        (lambda e, v: e.enum == "STRAINER" and inSystem(water)(e, v), 412),
+        (lambda e, v: e.enum == "STRAINER" and inSystem(gas)(e, v), 413),
+        (lambda e, v: e.enum == "STRAINER" and inSystem(rainWater)(e, v), 369),
+        (lambda e, v: e.enum == "STRAINER", 410),  # Abwasser-, Wasser-, Gasanlagen
+        (lambda e, v: e.enum == "WATERFILTER", 412),
+        (always, 400))),
+    # Abscheider: Bauwerk — Technische Anlagen
+    "IfcInterceptor": constant(400),
 
     # ----- IfcFurnishingElement: ----- #
-    def IfcFurniture():
-        return 610
-        # Allgemeine Ausstattung
-
-    def IfcSystemFurnitureElement():
-        return 610
-        # Allgemeine Ausstattung
-
-    switcher = {"IfcBeam": IfcBeam,
-                "IfcBuildingElementProxy": IfcBuildingElementProxy,
-                "IfcChimney": IfcChimney,
-                "IfcColumn": IfcColumn,
-                "IfcCovering": IfcCovering,
-                "IfcCurtainWall": IfcCurtainWall,
-                "IfcDoor": IfcDoor,
-                "IfcFooting": IfcFooting,
-                "IfcMember": IfcMember,
-                "IfcPile": IfcPile,
-                "IfcPlate": IfcPlate,
-                "IfcRailing": IfcRailing,
-                "IfcRamp": IfcRamp,
-                "IfcRampFlight": IfcRampFlight,
-                "IfcRoof": IfcRoof,
-                "IfcShadingDevice": IfcShadingDevice,
-                "IfcSlab": IfcSlab,
-                "IfcStair": IfcStair,
-                "IfcStairFlight": IfcStairFlight,
-                "IfcWall": IfcWall,
-                "IfcWallStandardCase": IfcWall,
-                "IfcWallElementedCase": IfcWall,
-                "IfcWindow": IfcWindow,
-                "IfcActuator": IfcActuator,
-                "IfcAlarm": IfcAlarm,
-                "IfcController": IfcController,
-                "IfcFlowInstrument": IfcFlowInstrument,
-                "IfcProtectiveDeviceTrippingUnit": IfcProtectiveDeviceTrippingUnit,
-                "IfcSensor": IfcSensor,
-                "IfcUnitaryControlElement": IfcUnitaryControlElement,
-                "IfcDistributionChamberElement": IfcDistributionChamberElement,
-                "IfcAirToAirHeatRecovery": IfcAirToAirHeatRecovery,
-                "IfcBoiler": IfcBoiler,
-                "IfcBurner": IfcBurner,
-                "IfcChiller": IfcChiller,
-                "IfcCoil": IfcCoil,
-                "IfcCondenser": IfcCondenser,
-                "IfcCooledBeam": IfcCooledBeam,
-                "IfcCoolingTower": IfcCoolingTower,
-                "IfcElectricGenerator": IfcElectricGenerator,
-                "IfcElectricMotor": IfcElectricMotor,
-                "IfcMotor": IfcEngine,
-                "IfcEvaporativeCooler": IfcEvaporativeCooler,
-                "IfcEvaporator": IfcEvaporator,
-                "IfcHeatExchanger": IfcHeatExchanger,
-                "IfcHumidifier": IfcHumidifier,
-                "IfcMotorConnection": IfcMotorConnection,
-                "IfcSolarDevice": IfcSolarDevice,
-                "IfcTransformer": IfcTransformer,
-                "IfcTubeBundle": IfcTubeBundle,
-                "IfcUnitaryEquipment": IfcUnitaryEquipment,
-                "IfcAirTerminalBox": IfcAirTerminalBox,
-                "IfcDamper": IfcDamper,
-                "IfcElectricDistributionBoard": IfcElectricDistributionBoard,
-                "IfcElectricTimeControl": IfcElectricTimeControl,
-                "IfcFlowMeter": IfcFlowMeter,
-                "IfcProtectiveDevice": IfcProtectiveDevice,
-                "IfcSwitchingDevice": IfcSwitchingDevice,
-                "IfcValve": IfcValve,
-                "IfcCableCarrierFitting": IfcCableCarrierFitting,
-                "IfcCableFitting": IfcCableFitting,
-                "IfcDuctFitting": IfcDuctFitting,
-                "IfcJunctionBox": IfcJunctionBox,
-                "IfcPipeFitting": IfcPipeFitting,
-                "IfcCompressor": IfcCompressor,
-                "IfcFan": IfcFan,
-                "IfcPump": IfcPump,
-                "IfcFlowSegment": IfcFlowSegment,
-                "IfcCableCarrierSegment": IfcCableCarrierSegment,
-                "IfcCableSegment": IfcCableSegment,
-                "IfcDuctSegment": IfcDuctSegment,
-                "IfcPipeSegment": IfcPipeSegment,
-                "IfcTank": IfcTank,
-                "IfcAirTerminal": IfcAirTerminal,
-                "IfcAudioVisualAppliance": IfcAudioVisualAppliance,
-                "IfcCommunicationsAppliance": IfcCommunicationsAppliance,
-                "IfcElectricAppliance": IfcElectricAppliance,
-                "IfcFireSuppressionTerminal": IfcFireSuppressionTerminal,
-                "IfcLamp": IfcLamp,
-                "IfcLightFixture": IfcLightFixture,
-                "IfcMedicalDevice": IfcMedicalDevice,
-                "IfcOutlet": IfcOutlet,
-                "IfcSanitaryTerminal": IfcSanitaryTerminal,
-                "IfcSpaceHeater": IfcSpaceHeater,
-                "IfcStackTerminal": IfcStackTerminal,
-                "IfcWasteTerminal": IfcWasteTerminal,
-                "IfcDuctSilencer": IfcDuctSilencer,
-                "IfcFilter": IfcFilter,
-                "IfcInterceptor": IfcInterceptor,
-                "IfcFurniture": IfcFurniture,
-                "IfcSystemFurnitureElement": IfcSystemFurnitureElement,
-                "IfcFlowTerminal": IfcFlowTerminal}
-
-    func = switcher.get(self.product.is_a(), lambda: None)
-    return func()
-
-
-def getKGname(self):
-    def KG300():
-        return "Bauwerk Baukonstruktionen"
-
-    def KG310():
-        return "Baugrube/Erdbau"
-
-    def KG311():
-        return "Herstellung"
-
-    def KG312():
-        return "Umschließung"
-
-    def KG313():
-        return "Wasserhaltung"
-
-    def KG314():
-        return "Vortrieb"
-
-    def KG319():
-        return "Sonstiges zur KG 310: Baugrube/Erdbau"
-
-    def KG320():
-        return "Gründung, Unterbau"
-
-    def KG321():
-        return "Baugrundverbesserung"
+    # Allgemeine Ausstattung
+    "IfcFurniture": constant(610),
+    "IfcSystemFurnitureElement": constant(610),
+}
+
+# Wände: Pset_WallCommon
+kgRules["IfcWall"] = kgRules["IfcWallStandardCase"] = kgRules["IfcWallElementedCase"] = (
+    "Pset_WallCommon", ("Reference", "IsExternal", "LoadBearing", "ExtendToStructure"), (
+        (lambda e, v: v["IsExternal"] is None, 300),
+        # Elementierte Wand (PredefinedType des Elements oder Wandtyps):
+        # Elementierte Außenwandkonstruktionen / Elementierte Innenwandkonstruktionen
+        (lambda e, v: e.enum == "ELEMENTEDWALL" and v["IsExternal"], 337),
+        (lambda e, v: e.enum == "ELEMENTEDWALL", 346),
+        # ohne LoadBearing: Außenwände / Innenwände (Vertikale Baukonstruktionen)
+        (lambda e, v: v["LoadBearing"] is None and v["IsExternal"], 330),
+        (lambda e, v: v["LoadBearing"] is None, 340),
+        (lambda e, v: v["ExtendToStructure"] is None, None),
+        # Tragende Außenwände
+        (lambda e, v: v["LoadBearing"] and v["IsExternal"] and not v["ExtendToStructure"], 331),
+        # Nichttragende Außenwände
+        (lambda e, v: not v["LoadBearing"] and v["IsExternal"] and not v["ExtendToStructure"], 332),
+        # Außenwandbekleidung, außen
+        (lambda e, v: not v["LoadBearing"] and v["IsExternal"] and v["ExtendToStructure"], 335),
+        # Außenwandbekleidung, innen
+        (lambda e, v: not v["LoadBearing"] and not v["IsExternal"] and (
+            v["ExtendToStructure"] and referenceForExternalWall in v["Reference"]), 336),
+        # Tragende Innenwände
+        (lambda e, v: v["LoadBearing"] and not v["IsExternal"] and not v["ExtendToStructure"], 341),
+        # Nichttragende Innenwände
+        (lambda e, v: not v["LoadBearing"] and not v["IsExternal"] and not v["ExtendToStructure"], 342),
+        # Innenwandbekleidung
+        (lambda e, v: not v["LoadBearing"] and not v["IsExternal"] and (
+            v["ExtendToStructure"] and referenceForInternalWall in v["Reference"]), 345),
+        (lambda e, v: not v["LoadBearing"] and not v["IsExternal"] and v["ExtendToStructure"], 000)))
+
+EMPTY_VALUES = {}
 
-    def KG322():
-        return "Flachgründungen und Bodenplatten"
 
-    def KG323():
-        return "Tiefgründungen"
-
-    def KG324():
-        return "Gründungsbeläge"
-
-    def KG325():
-        return "Abdichtungen und Bekleidungen"
-
-    def KG326():
-        return "Dränagen"
-
-    def KG329():
-        return "Sonstiges zur KG 320: Gründung, Unterbau"
-
-    def KG330():
-        return "Außenwände/Vertikale Baukonstruktionen, außen"
-
-    def KG331():
-        return "Tragende Außenwände"
-
-    def KG332():
-        return "Nichttragende Außenwände"
-
-    def KG333():
-        return "Außenstützen"
-
-    def KG334():
-        return "Außenwandöffnungen"
-
-    def KG335():
-        return "Außenwandbekleidungen, außen"
-
-    def KG336():
-        return "Außenwandbekleidungen, innen"
-
-    def KG337():
-        return "Elementierte Außenwandkonstruktionen"
-
-    def KG338():
-        return "Lichtschutz zur KG 330: Außenwände/Vertikale Baukonstruktionen, außen"
-
-    def KG339():
-        return "Sonstiges zur KG 330: Außenwände/Vertikale Baukonstruktionen, außen"
-
-    def KG340():
-        return "Innenwände/Vertikale Baukonstruktionen, innen"
-
-    def KG341():
-        return "Tragende Innenwände"
-
-    def KG342():
-        return "Nichttragende Innenwände"
-
-    def KG343():
-        return "Innenstützen"
-
-    def KG344():
-        return "Innenwandöffnungen"
-
-    def KG345():
-        return "Innenwandbekleidungen"
-
-    def KG346():
-        return "Elementierte Innenwandkonstruktionen"
-
-    def KG347():
-        return "Lichtschutz zur KG 340: Innenwände/Vertikale Baukonstruktionen, innen"
-
-    def KG349():
-        return "Sonstiges zur KG 340: Innenwände/Vertikale Baukonstruktionen, innen"
-
-    def KG350():
-        return "Decken/Horizontale Baukonstruktionen"
-
-    def KG351():
-        return "Deckenkonstruktionen"
-
-    def KG352():
-        return "Deckenöffnungen"
-
-    def KG353():
-        return "Deckenbeläge"
-
-    def KG354():
-        return "Deckenbekleidungen"
-
-    def KG355():
-        return "Elementierte Deckenkonstruktionen"
-
-    def KG359():
-        return "Sonstiges zur KG 350: Decken/Horizontale Baukonstruktionen"
-
-    def KG360():
-        return "Dächer"
-
-    def KG361():
-        return "Dachkonstruktionen"
-
-    def KG362():
-        return "Dachöffnungen"
-
-    def KG363():
-        return "Dachbeläge"
-
-    def KG364():
-        return "Dachbekleidungen"
-
-    def KG365():
-        return "Elementierte Dachkonstruktionen"
-
-    def KG366():
-        return "Lichtschutz zur KG 360: Dächer"
-
-    def KG369():
-        return "Sonstiges zur KG 360: Dächer"
-
-    def KG400():
-        return "Bauwerk — Technische Anlagen"
-
-    def KG410():
-        return "Abwasser-, Wasser-, Gasanlagen"
-
-    def KG411():
-        return "Abwasseranlagen"
-
-    def KG412():
-        return "Wasseranlagen"
-
-    def KG413():
-        return "Gasanlagen"
-
-    def KG419():
-        return "Sonstiges zur KG 410: Abwasser-, Wasser-, Gasanlagen"
-
-    def KG420():
-        return "Wärmeversorgungsanlagen"
-
-    def KG421():
-        return "Wärmeerzeugungsanlagen"
-
-    def KG422():
-        return "Wärmeverteilnetze"
-
-    def KG423():
-        return "Raumheizflächen"
-
-    def KG424():
-        return "Verkehrsheizflächen"
-
-    def KG429():
-        return "Sonstiges zur KG 420: Wärmeversorgungsanlagen"
-
-    def KG430():
-        return "Raumlufttechnische Anlagen"
-
-    def KG431():
-        return "Lüftungsanlagen"
-
-    def KG432():
-        return "Teilklimaanlagen"
-
-    def KG433():
-        return "Klimaanlagen"
-
-    def KG434():
-        return "Kälteanlagen"
-
-    def KG439():
-        return "Sonstiges zur KG 430: Raumlufttechnische Anlagen"
-
-    def KG440():
-        return "Elektrische Anlagen"
-
-    def KG441():
-        return "Hoch- und Mittelspannungsanlagen"
-
-    def KG442():
-        return "Eigenstromversorgungsanlagen"
-
-    def KG443():
-        return "Niederspannungsschaltanlagen"
-
-    def KG444():
-        return "Niederspannungsinstallationsanlagen"
-
-    def KG445():
-        return "Beleuchtungsanlagen"
-
-    def KG446():
-        return "Blitzschutz- und Erdungsanlagen"
-
-    def KG447():
-        return "Fahrleitungssysteme"
-
-    def KG449():
-        return "Sonstiges zur KG 440: Elektrische Anlagen"
-
-    def KG450():
-        return "Kommunikations-, sicherheits- und informationstechnische Anlagen"
-
-    def KG451():
-        return "Telekommunikationsanlagen"
-
-    def KG452():
-        return "Such- und Signalanlagen"
-
-    def KG453():
-        return "Zeitdienstanlagen"
-
-    def KG454():
-        return "Elektroakustische Anlagen"
-
-    def KG455():
-        return "Audiovisuelle Medien- und Antennenanlagen"
-
-    def KG456():
-        return "Gefahrenmelde- und Alarmanlagen"
-
-    def KG457():
-        return "Datenübertragungsnetze"
-
-    def KG458():
-        return "Verkehrsbeeinflussungsanlagen"
-
-    def KG459():
-        return "Sonstiges zur KG 450: Kommunikations-, sicherheits- und informationstechnische Anlagen"
-
-    def KG460():
-        return "Förderanlagen"
-
-    def KG461():
-        return "Aufzugsanlagen"
-
-    def KG462():
-        return "Fahrtreppen, Fahrsteige"
-
-    def KG463():
-        return "Befahranlagen"
-
-    def KG464():
-        return "Transportanlagen"
-
-    def KG465():
-        return "Krananlagen"
-
-    def KG466():
-        return "Hydraulikanlagen"
-
-    def KG469():
-        return "Sonstiges zur KG 460: Förderanlagen"
-
-    def KG470():
-        return "Nutzungsspezifische und verfahrenstechnische Anlagen"
-
-    def KG471():
-        return "Küchentechnische Anlagen"
-
-    def KG472():
-        return "Wäscherei-, Reinigungsund badetechnische Anlagen"
-
-    def KG473():
-        return "Medienversorgungsanlagen, Medizin- und labortechnische Anlagen"
-
-    def KG474():
-        return "Feuerlöschanlagen"
-
-    def KG475():
-        return "Prozesswärme-, kälte- und -luftanlagen"
-
-    def KG476():
-        return "Weitere nutzungsspezifische Anlagen"
-
-    def KG477():
-        return "Verfahrenstechnische Anlagen, Wasser, Abwasser und Gase"
+def getKG(self):
+    rule = kgRules.get(self.product.is_a())
+    if rule is None:
+        return None
+
+    property_set, property_names, conditions = rule
+    if property_names:
+        values = dict(zip(property_names, property_values(self.product, property_set, *property_names)))
+    else:
+        values = EMPTY_VALUES
+
+    for condition, kg in conditions:
+        if condition(self, values):
+            return kg
+    return None
 
-    def KG478():
-        return "Verfahrenstechnische Anlagen, Feststoffe, Wertstoffe und Abfälle"
 
-    def KG479():
-        return "Sonstiges zur KG 470: Nutzungsspezifische und verfahrenstechnische Anlagen"
+def getKGs(elements):
+    # Kostengruppen für viele Elemente (eLCA_Produkt o.ä. mit product, enum, system, name)
+    return [getKG(e) for e in elements]
 
-    def KG480():
-        return "Gebäude- und Anlagenautomation"
 
-    def KG481():
-        return "Automationseinrichtungen"
+# ----- Bezeichnungen der Kostengruppen (DIN 276) ----- #
+# Nummer -> Bezeichnung aus einer Datendatei, damit eine neue Fassung der DIN 276 ohne Codeänderung
+# eingespielt werden kann (Format: "Nummer;Bezeichnung", UTF-8, erste Zeile Überschrift).
+KG_NAMES_FILE = os.environ.get('IFC2LCA_KG_NAMES', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                'KG_DIN276.csv'))
 
-    def KG482():
-        return "Schaltschränke, Automationsschwerpunkte"
+kgNames = {}
 
-    def KG483():
-        return "Automationsmanagement"
 
-    def KG484():
-        return "Kabel, Leitungen und Verlegesysteme"
+def emittedKGs():
+    # alle Kostengruppen, die getKG liefern kann
+    return set(kg for property_set, property_names, conditions in kgRules.values()
+               for condition, kg in conditions if kg is not None)
 
-    def KG485():
-        return "Datenübertragungsnetze"
 
-    def KG489():
-        return "Sonstiges zur KG 480: Gebäude- und Anlagenautomation"
+def loadKGnames(filename=KG_NAMES_FILE):
+    global kgNames
 
-    def KG600():
-        return "Ausstattung und Kunstwerke"
+    names = {}
+    with open(filename, encoding='utf-8') as file:
+        reader = csv.reader(file, delimiter=';')
+        next(reader, None)
+        for row in reader:
+            if row:
+                names[int(row[0])] = row[1].strip()
 
-    def KG610():
-        return "Allgemeine Ausstattung"
+    # Selbsttest: jede Kostengruppe aus den Regeltabellen braucht eine Bezeichnung
+    missing = sorted(emittedKGs() - set(names))
+    if missing:
+        raise ValueError('%s: keine Bezeichnung für Kostengruppe(n) %s' % (filename, ', '.join(map(str, missing))))
 
-    def KG620():
-        return "Besondere Ausstattung"
+    kgNames = names
+    return names
 
-    def KG630():
-        return "Informationstechnische Ausstattung"
 
-    def KG640():
-        return "Künstlerische Ausstattung"
+loadKGnames()
 
-    def KG690():
-        return "Sonstige Ausstattung"
 
-    def KGunklar():
-        return "Kostengruppe kann nicht ermittelt werden. Grund dafür ist Mangel an Information."
+def getKGname(self):
+    return kgNames.get(self.KG)
 
-    switcher = {
-        300: KG300,
-        310: KG310,
-        311: KG311,
-        312: KG312,
-        313: KG313,
-        314: KG314,
-        319: KG319,
-        320: KG320,
-        321: KG321,
-        322: KG322,
-        323: KG323,
-        324: KG324,
-        325: KG325,
-        326: KG326,
-        329: KG329,
-        330: KG330,
-        331: KG331,
-        332: KG332,
-        333: KG333,
-        334: KG334,
-        335: KG335,
-        336: KG336,
-        337: KG337,
-        338: KG338,
-        339: KG339,
-        340: KG340,
-        341: KG341,
-        342: KG342,
-        343: KG343,
-        344: KG344,
-        345: KG345,
-        346: KG346,
-        347: KG347,
-        349: KG349,
-        350: KG350,
-        351: KG351,
-        352: KG352,
-        353: KG353,
-        354: KG354,
-        355: KG355,
-        359: KG359,
-        360: KG360,
-        361: KG361,
-        362: KG362,
-        363: KG363,
-        364: KG364,
-        365: KG365,
-        366: KG366,
-        369: KG369,
-        400: KG400,
-        410: KG410,
-        411: KG411,
-        412: KG412,
-        413: KG413,
-        419: KG419,
-        420: KG420,
-        421: KG421,
-        422: KG422,
-        423: KG423,
-        424: KG424,
-        429: KG429,
-        430: KG430,
-        431: KG431,
-        432: KG432,
-        433: KG433,
-        434: KG434,
-        439: KG439,
-        440: KG440,
-        441: KG441,
-        442: KG442,
-        443: KG443,
-        444: KG444,
-        445: KG445,
-        446: KG446,
-        447: KG447,
-        449: KG449,
-        450: KG450,
-        451: KG451,
-        452: KG452,
-        453: KG453,
-        454: KG454,
-        455: KG455,
-        456: KG456,
-        457: KG457,
-        458: KG458,
-        459: KG459,
-        460: KG460,
-        461: KG461,
-        462: KG462,
-        463: KG464,
-        464: KG464,
-        465: KG465,
-        466: KG466,
-        469: KG469,
-        470: KG470,
-        471: KG471,
-        472: KG472,
-        473: KG473,
-        474: KG474,
-        475: KG475,
-        476: KG476,
-        477: KG477,
-        478: KG478,
-        479: KG479,
-        480: KG480,
-        481: KG481,
-        482: KG482,
-        483: KG483,
-        484: KG484,
-        485: KG485,
-        489: KG489,
-        600: KG600,
-        610: KG610,
-        620: KG620,
-        630: KG630,
-        640: KG640,
-        690: KG690,
-        000: KGunklar}
 
-    func = switcher.get(self.KG, lambda: None)
-    return func()
+def getKGnames(elements):
+    return [getKGname(e) for e in elements]
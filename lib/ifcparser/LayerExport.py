@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+# ----- Ausgabe je Materialschicht (optional) ----- #
+# Die Material-Spalte der CSV fasst alle Schichten eines Aufbaus zu einem Text zusammen, Schichtdicken fehlen.
+# Mit --layers entsteht zusätzlich <csv>-layers.csv mit einer Zeile je (Element, Schicht):
+#   GUID;Name;Typ;KostengruppeNr;Schicht;Material;Dicke;Rohdichte;Flaeche;Masse
+# in m, kg/m³, m², kg. Die Schichten stammen aus dem Material-Cache (MaterialIndex.material_layers) und
+# werden beim Extrahieren ohnehin für die Masse ermittelt; Elemente ohne Material erscheinen nicht.
+
+layerHeader = ['GUID', 'Name', 'Typ', 'KostengruppeNr', 'Schicht', 'Material', 'Dicke', 'Rohdichte', 'Flaeche',
+               'Masse']
+
+
+def layer_rows(guid, name, ifc_class, kg, area, layers, masses):
+    masses = masses or [None] * len(layers or ())
+    for number, ((material, density, thickness), mass) in enumerate(zip(layers or (), masses), 1):
+        yield [guid, name, ifc_class, kg, number, material, thickness, density, area, mass]
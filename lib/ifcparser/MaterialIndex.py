@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+from PropertyIndex import property_lookup
+from Instrumentation import record_cache
+from Units import si_value
+
+# ----- Material-Cache ----- #
+# Die gleichen wenigen hundert IfcMaterial-Entities und Schichtaufbauten werden von tausenden Elementen
+# geteilt. Name und Rohdichte eines Materials sowie die zusammengesetzte Materialangabe eines
+# Aufbaus (Layer-/Profile-/Constituent-Set, Materialliste) werden daher je Modell nur einmal ermittelt.
+#   material id          -> (Name, MassDensity in kg/m³)
+#   Aufbau id            -> (Namen, Rohdichten, Schichtdicken in m)
+#   (Aufbau ids) je Element -> (Materialangabe, Rohdichte(n))
+# build_material_index füllt die Tabelle für alle zugeordneten Aufbauten in einem Durchlauf über
+# IfcRelAssociatesMaterial; nicht erfasste Aufbauten werden bei Bedarf nachgetragen.
+
+_materials = {}
+_compositions = {}
+_results = {}
+
+
+def reset_material_cache():
+    _materials.clear()
+    _compositions.clear()
+    _results.clear()
+
+
+def material_info(material):
+    key = material.id()
+    info = _materials.get(key)
+    record_cache('material', info is not None)
+    if info is None:
+        density, unit = property_lookup(material, 'Pset_MaterialCommon', 'MassDensity')
+        info = (material.Name, si_value(density, 'MASSDENSITYUNIT', unit))
+        _materials[key] = info
+    return info
+
+
+def composition_entity(relatingMaterial):
+    # *Usage teilen sich den Aufbau (ForLayerSet / ForProfileSet)
+    if relatingMaterial.is_a("IfcMaterialLayerSetUsage"):
+        return relatingMaterial.ForLayerSet
+    elif relatingMaterial.is_a("IfcMaterialProfileSetUsage"):
+        return relatingMaterial.ForProfileSet
+    return relatingMaterial
+
+
+def composition_materials(composition):
+    if composition.is_a("IfcMaterial"):
+        return [composition]
+    elif composition.is_a("IfcMaterialConstituentSet"):
+        return [materialConstituent.Material for materialConstituent in composition.MaterialConstituents
+                if materialConstituent.is_a("IfcMaterialConstituent")]
+    elif composition.is_a("IfcMaterialLayerSet"):
+        return [materialLayer.Material for materialLayer in composition.MaterialLayers
+                if materialLayer.is_a('IfcMaterialLayer')]
+    elif composition.is_a("IfcMaterialProfileSet"):
+        return [materialProfile.Material for materialProfile in composition.MaterialProfiles
+                if materialProfile.is_a('IfcMaterialProfile')]
+    elif composition.is_a('IfcMaterialList'):
+        return [material for materialList in composition for material in materialList
+                if material.is_a('IfcMaterial')]
+    return []
+
+
+def composition_thicknesses(composition):
+    if composition.is_a("IfcMaterialLayerSet"):
+        return tuple(si_value(materialLayer.LayerThickness, 'LENGTHUNIT')
+                     for materialLayer in composition.MaterialLayers if materialLayer.is_a('IfcMaterialLayer'))
+    return ()
+
+
+def composition_info(relatingMaterial):
+    composition = composition_entity(relatingMaterial)
+    key = composition.id()
+    info = _compositions.get(key)
+    record_cache('composition', info is not None)
+    if info is None:
+        names, densities = [], []
+        for material in composition_materials(composition):
+            name, density = material_info(material)
+            names.append(name)
+            densities.append(density)
+        info = (names, densities, composition_thicknesses(composition))
+        _compositions[key] = info
+    return info
+
+
+def build_material_index(model):
+    reset_material_cache()
+    for rel in model.by_type("IfcRelAssociatesMaterial"):
+        try:
+            composition_info(rel.RelatingMaterial)
+            material_result([rel.RelatingMaterial])
+        except AttributeError:
+            # unvollständiger Aufbau (z.B. Schicht ohne Material): Fehler erst beim Element melden
+            pass
+
+
+def material_result(relatingMaterials):
+    # Materialangabe eines Elements aus allen zugeordneten Materialdefinitionen;
+    # das Ergebnis wird von allen Elementen mit gleicher Zuordnung geteilt und darf nicht verändert werden
+    key = tuple(composition_entity(relatingMaterial).id() for relatingMaterial in relatingMaterials)
+    result = _results.get(key)
+    record_cache('material_result', result is not None)
+    if result is not None:
+        return result
+
+    material_list = []
+    densities = []
+    for relatingMaterial in relatingMaterials:
+        names, composition_densities = composition_info(relatingMaterial)[:2]
+        material_list.extend(names)
+        densities.extend(composition_densities)
+
+    if len(densities) == 1:
+        densities = densities[0]
+    elif len(material_list) == 0:
+        densities = None
+    else:
+        densities = tuple(densities)
+
+    if len(material_list) == 1:
+        result = material_list[0], densities
+    elif len(material_list) == 0:
+        result = "", densities
+    else:
+        material_list_string = str(material_list).replace("[", "")
+        material_list_string = material_list_string.replace("]", "")
+        material_list_string = material_list_string.replace(";", ",")
+        result = material_list_string, densities
+
+    _results[key] = result
+    return result
+
+
+def material_layers(relatingMaterials):
+    # Schichten aller zugeordneten Aufbauten als (Material, Rohdichte, Dicke); Dicke nur bei Schichtaufbauten
+    layers = []
+    for relatingMaterial in relatingMaterials:
+        names, densities, thicknesses = composition_info(relatingMaterial)
+        if len(thicknesses) != len(names):
+            thicknesses = (None,) * len(names)
+        layers.extend(zip(names, densities, thicknesses))
+    return layers
+
+
+def layer_thicknesses(relatingMaterials):
+    # Schichtdicken aller zugeordneten Schichtaufbauten (IfcMaterialLayerSet / -Usage)
+    layerThickness_list = []
+    for relatingMaterial in relatingMaterials:
+        layerThickness_list.extend(composition_info(relatingMaterial)[2])
+    return layerThickness_list
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# ----- Masse ----- #
+# Masse je Materialschicht in kg aus den Schichten des Aufbaus (MaterialIndex.material_layers, bereits in SI):
+#   Schicht mit Dicke, Element mit Fläche    Fläche * Schichtdicke * Rohdichte
+#   Schicht mit Dicke, Element ohne Fläche   Volumen * Schichtdicke / Gesamtdicke * Rohdichte
+#   einzelnes Material / Profil              Volumen * Rohdichte
+# Die Gesamtmasse ist die Summe der Schichten, sofern jede Schicht bestimmt werden konnte.
+# Die Spalte Masse der CSV liest der eLCA-Import als Volumen (m³) anstelle der Fläche; die Massen werden
+# daher nur in eine eigene Datei geschrieben (<csv>-mass.csv, Option --mass).
+
+massHeader = ['GUID', 'Masse', 'Schichtmassen']
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def layer_masses(layers, area=None, volume=None):
+    # layers: [(Material, Rohdichte, Dicke)]; None für Schichten ohne bestimmbare Masse
+    thicknesses = [thickness for name, density, thickness in layers]
+    total_thickness = sum(thicknesses) if all(is_number(thickness) for thickness in thicknesses) else 0
+    masses = []
+    for name, density, thickness in layers:
+        if not is_number(density):
+            mass = None
+        elif is_number(thickness) and area is not None:
+            mass = area * thickness * density
+        elif total_thickness and volume is not None:
+            mass = volume * thickness / total_thickness * density
+        elif len(layers) == 1 and volume is not None:
+            mass = volume * density
+        else:
+            mass = None
+        masses.append(mass)
+    return masses
+
+
+def total_mass(masses):
+    if not masses or None in masses:
+        return None
+    return sum(masses)
+
+
+def mass_row(guid, mass, masses):
+    return [guid, mass, ', '.join('' if layer_mass is None else str(layer_mass) for layer_mass in masses or ())]
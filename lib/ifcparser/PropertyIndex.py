@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# ----- Property-Index ----- #
+# Statt bei jeder Abfrage IsDefinedBy -> HasProperties/Quantities neu zu durchlaufen,
+# werden alle Property- und Quantity-Sets eines Modells einmalig eingelesen:
+#   element id -> pset name -> property name -> (value, unit)
+# Materialeigenschaften (IfcMaterialProperties) landen ebenfalls im Index (Schlüssel = Material-Id).
+# Property-Sets des Typobjekts ergänzen die des Elements; Werte am Element haben Vorrang.
+
+from fnmatch import fnmatchcase
+from TypeIndex import type_of, type_property_sets
+
+EMPTY = {}
+NOT_FOUND = (None, None)
+
+# Reihenfolge der Mengen-Sets, in denen nach Flächen/Volumen gesucht wird (erster Treffer gewinnt)
+QUANTITY_SETS = ("QTo_WallBaseQuantities", "BaseQuantities", "Qto_*BaseQuantities")
+
+_index = None
+_entries_cache = {}
+
+
+def property_entries(property_definition):
+    # Liefert (property name, (value, unit)) für ein IfcPropertySet, IfcElementQuantity oder IfcMaterialProperties
+    if hasattr(property_definition, 'HasProperties'):
+        properties = property_definition.HasProperties
+    elif hasattr(property_definition, 'Quantities'):
+        # IfcPhysicalSimpleQuantity: Name, Description, Unit, <...>Value
+        return [(q.Name, (q[3], q.Unit)) for q in property_definition.Quantities
+                if q.is_a('IfcPhysicalSimpleQuantity')]
+    elif hasattr(property_definition, 'Properties'):
+        properties = property_definition.Properties
+    else:
+        return []
+
+    entries = []
+    for v in properties:
+        if hasattr(v, 'NominalValue'):
+            value = v.NominalValue.wrappedValue if v.NominalValue is not None else None
+            entries.append((v.Name, (value, v.Unit)))
+    return entries
+
+
+def cached_property_entries(property_definition):
+    # ein Pset wird häufig mehreren Elementen zugeordnet -> Einträge nur einmal auslesen
+    key = property_definition.id()
+    entries = _entries_cache.get(key)
+    if entries is None:
+        entries = property_entries(property_definition)
+        _entries_cache[key] = entries
+    return entries
+
+
+def add_property_definition(psets, property_definition):
+    # IFC4: RelatingPropertyDefinition kann auch ein IfcPropertySetDefinitionSet (Tupel) sein
+    if isinstance(property_definition, tuple):
+        for definition in property_definition:
+            add_property_definition(psets, definition)
+        return
+
+    properties = psets.setdefault(property_definition.Name, {})
+    for name, value_unit in cached_property_entries(property_definition):
+        # erster Treffer gewinnt, wie bei der Suche über IsDefinedBy
+        properties.setdefault(name, value_unit)
+
+
+def build_property_index(model, types=EMPTY):
+    # types: element id -> Typobjekt (TypeIndex.build_type_index)
+    global _index
+    _entries_cache.clear()
+
+    index = {}
+    for rel in model.by_type("IfcRelDefinesByProperties"):
+        property_definition = rel.RelatingPropertyDefinition
+        if property_definition is None:
+            continue
+        for element in rel.RelatedObjects:
+            add_property_definition(index.setdefault(element.id(), {}), property_definition)
+
+    # Typ-Psets erst danach: fehlende Properties werden ergänzt, vorhandene nicht überschrieben
+    for element_id, type_object in types.items():
+        property_sets = type_property_sets(type_object)
+        if not property_sets:
+            continue
+        psets = index.setdefault(element_id, {})
+        for property_definition in property_sets:
+            add_property_definition(psets, property_definition)
+
+    # Materialeigenschaften (IFC4), 2x3 ToDo: IfcExtendedMaterialProperties
+    for material_properties in model.by_type("IfcMaterialProperties"):
+        if not hasattr(material_properties, 'Properties') or material_properties.Material is None:
+            continue
+        add_property_definition(index.setdefault(material_properties.Material.id(), {}), material_properties)
+
+    _entries_cache.clear()
+    _index = index
+    return index
+
+
+def reset_property_index():
+    global _index
+    _index = None
+    _entries_cache.clear()
+
+
+def psets_of(ifc_element):
+    if _index is not None:
+        return _index.get(ifc_element.id(), EMPTY)
+
+    # ohne Index (z.B. KG.py einzeln genutzt): Psets des Elements direkt einlesen
+    psets = {}
+    for s in getattr(ifc_element, 'IsDefinedBy', ()):
+        if hasattr(s, 'RelatingPropertyDefinition') and s.RelatingPropertyDefinition is not None:
+            add_property_definition(psets, s.RelatingPropertyDefinition)
+    for e in getattr(ifc_element, 'HasProperties', ()):
+        if hasattr(e, 'Properties'):
+            add_property_definition(psets, e)
+    if hasattr(ifc_element, 'IsDefinedBy'):
+        for property_definition in type_property_sets(type_of(ifc_element)):
+            add_property_definition(psets, property_definition)
+    _entries_cache.clear()
+    return psets
+
+
+def property_lookup(ifc_element, property_set, property_name):
+    return psets_of(ifc_element).get(property_set, EMPTY).get(property_name, NOT_FOUND)
+
+
+def property_finder(ifc_element, property_set, property_name):
+    return property_lookup(ifc_element, property_set, property_name)[0]
+
+
+def property_finder_unit(ifc_element, property_set, property_name):
+    return property_lookup(ifc_element, property_set, property_name)[1]
+
+
+def material_property_finder(material, property_set, property_name):
+    return property_lookup(material, property_set, property_name)[0]
+
+
+def property_values(ifc_element, property_set, *property_names):
+    # mehrere Properties eines Psets mit einem Zugriff auf das Pset
+    properties = psets_of(ifc_element).get(property_set, EMPTY)
+    return [properties.get(name, NOT_FOUND)[0] for name in property_names]
+
+
+def quantity_finder(ifc_element, quantity_name, property_sets=QUANTITY_SETS):
+    # Wert und Einheit gemeinsam, über eine geordnete Liste von (Quantity-)Sets;
+    # Platzhalter wie "Qto_*BaseQuantities" passen auf alle gleichartig benannten Sets
+    psets = psets_of(ifc_element)
+    if not psets:
+        return NOT_FOUND
+    for property_set in property_sets:
+        if '*' in property_set:
+            candidates = [psets[name] for name in psets if fnmatchcase(name, property_set)]
+        else:
+            candidates = [psets.get(property_set, EMPTY)]
+        for properties in candidates:
+            value_unit = properties.get(quantity_name, NOT_FOUND)
+            if value_unit[0] is not None:
+                return value_unit
+    return NOT_FOUND
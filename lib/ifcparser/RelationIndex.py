@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# ----- Beziehungs-Index ----- #
+# Geschoss, Verteilsystem und Material hängen über inverse Beziehungen am Element
+# (ContainedInStructure, HasAssignments, HasAssociations). Jede inverse Abfrage durchsucht in
+# ifcopenshell das ganze Modell - statt dessen werden die drei Beziehungsarten einmalig vorwärts gelesen:
+#   element id -> Geschossname
+#   element id -> Systemname (ObjectType der Gruppe)
+#   element id -> [RelatingMaterial, ...]
+
+_storeys = None
+_systems = None
+_materials = None
+
+
+def build_relation_index(model):
+    global _storeys, _systems, _materials
+
+    storeys = {}
+    for rel in model.by_type("IfcRelContainedInSpatialStructure"):
+        name = rel.RelatingStructure.Name
+        for element in rel.RelatedElements:
+            # erster Treffer gewinnt, wie bei der Suche über ContainedInStructure
+            storeys.setdefault(element.id(), name)
+
+    systems = {}
+    for rel in model.by_type("IfcRelAssignsToGroup"):
+        name = rel.RelatingGroup.ObjectType
+        for element in rel.RelatedObjects:
+            systems.setdefault(element.id(), name)
+
+    materials = {}
+    for rel in model.by_type("IfcRelAssociatesMaterial"):
+        relatingMaterial = rel.RelatingMaterial
+        for element in rel.RelatedObjects:
+            materials.setdefault(element.id(), []).append(relatingMaterial)
+
+    _storeys, _systems, _materials = storeys, systems, materials
+
+
+def reset_relation_index():
+    global _storeys, _systems, _materials
+    _storeys = _systems = _materials = None
+
+
+def storey_of(ifc_element):
+    if _storeys is not None:
+        return _storeys.get(ifc_element.id())
+
+    # ohne Index (z.B. KG.py einzeln genutzt): inverse Beziehung direkt abfragen
+    for rel_contained in getattr(ifc_element, 'ContainedInStructure', ()):
+        return rel_contained.RelatingStructure.Name
+
+
+def system_of(ifc_element):
+    if _systems is not None:
+        return _systems.get(ifc_element.id())
+
+    for s in ifc_element.HasAssignments:
+        if s.is_a('IfcRelAssignsToGroup'):
+            return s.RelatingGroup.ObjectType
+
+
+def relating_materials_of(ifc_element):
+    if _materials is not None:
+        return _materials.get(ifc_element.id(), [])
+
+    return [relAssociates.RelatingMaterial for relAssociates in ifc_element.HasAssociations
+            if relAssociates.is_a('IfcRelAssociatesMaterial')]
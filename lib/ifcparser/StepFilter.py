@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# ----- Selektives Laden ----- #
+# Der Parser liest nur Produkte, Beziehungen, Psets/Mengen, Materialien und Einheiten. Die Geometrie
+# (Punkte, Flächen, Körper, Platzierungen, Darstellungsstile) macht bei großen Modellen aber den
+# Großteil der Entities aus. open_selective zerlegt die STEP-Datei an ';' außerhalb von Strings, merkt sich
+# die Offsets der benötigten Entities und übergibt ifcopenshell nur diese:
+#   - Entities der Geometrie-Klassen (GEOMETRY_ROOTS und Unterklassen) entfallen
+#   - Verweise darauf werden zu $ bzw. aus Listen entfernt
+#     (IfcProductDefinitionShape bleibt erhalten -> p.Representation is None funktioniert weiter)
+# Das spart Speicher (20.000 Elemente: 171 statt 206 MB), kostet aber Laufzeit: Filtern und Laden dauern
+# zusammen länger als ifcopenshell.open der ganzen Datei (2,9 s statt 1,0 s).
+
+import os
+import re
+import mmap
+import tempfile
+import ifcopenshell
+import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+GEOMETRY_ROOTS = ("IfcRepresentationItem", "IfcRepresentation", "IfcRepresentationMap", "IfcRepresentationContext",
+                  "IfcObjectPlacement", "IfcConnectionGeometry", "IfcShapeAspect", "IfcProfileDef",
+                  "IfcPresentationItem", "IfcPresentationLayerAssignment", "IfcPresentationStyle",
+                  "IfcPresentationStyleAssignment", "IfcColourSpecification", "IfcTextureCoordinate",
+                  "IfcTextureVertex", "IfcSurfaceTexture")
+
+ENTITY = re.compile(rb'\s*#(\d+)\s*=\s*([A-Za-z0-9_]+)\s*\(')
+# Anweisung bis zum nächsten ';' außerhalb von Strings ('' im String = zwei aufeinanderfolgende Strings)
+STATEMENT = re.compile(rb"[^;']*(?:'[^']*'[^;']*)*;")
+REFERENCE = re.compile(rb'#(\d+)')
+FILE_SCHEMA = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']+)'")
+
+
+def geometry_types(schema_name):
+    # STEP-Namen (Großbuchstaben) aller Geometrie-Klassen des Schemas
+    schema = wrapper.schema_by_name(schema_name)
+    names = set()
+    stack = []
+    for root in GEOMETRY_ROOTS:
+        try:
+            stack.append(schema.declaration_by_name(root))
+        except RuntimeError:
+            pass  # Klasse gibt es im Schema nicht (z.B. IfcPresentationItem in IFC2x3)
+    while stack:
+        declaration = stack.pop()
+        names.add(declaration.name().upper().encode('ascii'))
+        stack.extend(declaration.subtypes())
+    return names
+
+
+def statements(data, start=0):
+    # (offset, Anweisung) ab start - eine Entity kann über mehrere Zeilen gehen, eine Zeile mehrere
+    # Entities enthalten; gesucht wird nur bis zum letzten ';' (danach kann keine Anweisung mehr enden)
+    end = data.rfind(b';') + 1
+    for match in STATEMENT.finditer(data, start, end):
+        yield match.start(), match.group()
+
+
+def parse_arguments(s, i):
+    # Argumentliste ab s[i] (nach der öffnenden Klammer) -> [(text, unterliste oder None), ...], Ende
+    items = []
+    current = []
+    sublist = None
+    while True:
+        c = s[i]
+        if c == "'":
+            j = i + 1
+            while True:
+                j = s.index("'", j)
+                if s[j + 1:j + 2] == "'":
+                    j += 2
+                else:
+                    break
+            current.append(s[i:j + 1])
+            i = j + 1
+        elif c == '(':
+            sublist, i = parse_arguments(s, i + 1)
+        elif c == ',':
+            items.append((''.join(current).strip(), sublist))
+            current = []
+            sublist = None
+            i += 1
+        elif c == ')':
+            text = ''.join(current).strip()
+            if text or sublist is not None or items:
+                items.append((text, sublist))
+            return items, i + 1
+        else:
+            current.append(c)
+            i += 1
+
+
+def format_arguments(items, dropped, top):
+    parts = []
+    for text, sublist in items:
+        if sublist is None and text.startswith('#') and is_dropped(dropped, int(text[1:])):
+            if top:
+                parts.append('$')  # einzelnes Attribut
+            continue  # Listenelement entfällt
+        if sublist is not None:
+            text += '(' + format_arguments(sublist, dropped, False) + ')'
+        parts.append(text)
+    return ','.join(parts)
+
+
+def strip_references(statement, dropped):
+    # latin-1: jedes Byte bleibt beim Zurückschreiben unverändert
+    s = statement.decode('latin-1')
+    start = s.index('(') + 1
+    items, end = parse_arguments(s, start)
+    return (s[:start] + format_arguments(items, dropped, True) + s[end - 1:]).encode('latin-1')
+
+
+def is_dropped(dropped, entity_id):
+    return entity_id < len(dropped) and dropped[entity_id]
+
+
+def write_selective(ifc_filename, out):
+    # liefert die Anzahl übernommener und ausgelassener Entities
+    with open(ifc_filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header_end = 0
+        for offset, statement in statements(data):
+            header_end = offset + len(statement)
+            if statement.strip().upper() == b'DATA;':
+                break
+        header = data[:header_end]
+        match = FILE_SCHEMA.search(header)
+        skipped_types = geometry_types(match.group(1).decode('ascii'))
+
+        # 1. Durchlauf: Offsets der benötigten Entities, Bitmaske (id -> ausgelassen)
+        kept = []
+        dropped = bytearray()
+        footer = []
+        for offset, statement in statements(data, header_end):
+            match = ENTITY.match(statement)
+            if match is None:
+                footer.append(statement)  # ENDSEC; END-ISO-10303-21;
+                continue
+            if match.group(2).upper() in skipped_types:
+                entity_id = int(match.group(1))
+                if entity_id >= len(dropped):
+                    dropped.extend(bytes(entity_id + 1 - len(dropped) + 4096))
+                dropped[entity_id] = 1
+            else:
+                kept.append((offset, len(statement)))
+
+        # 2. Durchlauf: nur die gemerkten Entities lesen, Verweise auf ausgelassene entfernen
+        out.write(header.rstrip() + b'\n')
+        for offset, length in kept:
+            statement = data[offset:offset + length]
+            if any(is_dropped(dropped, int(i)) for i in REFERENCE.findall(statement, statement.index(b'='))):
+                statement = strip_references(statement, dropped)
+            # je Entity eine Zeile, auch wenn im Original mehrere in einer Zeile standen
+            out.write(statement.strip() + b'\n')
+        out.write(b'\n'.join(statement.strip() for statement in footer) + b'\n')
+
+    return len(kept), sum(dropped)
+
+
+def open_selective(ifc_filename):
+    handle, filtered_filename = tempfile.mkstemp(suffix='.ifc')
+    try:
+        with os.fdopen(handle, 'wb') as out:
+            write_selective(ifc_filename, out)
+        return ifcopenshell.open(filtered_filename)
+    finally:
+        os.unlink(filtered_filename)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# ----- Lazy STEP-Reader ----- #
+# Für sehr große IFC-Dateien (1-2 GB): statt das ganze Modell mit ifcopenshell zu laden, wird die Datei
+# per mmap eingeblendet und in einem Durchlauf ein kompakter Index aufgebaut:
+#   #id -> Byte-Offset / Länge der Entity   (array, Position = id)
+#   STEP-Klasse -> ids                        (array je Klasse)
+# Entities werden erst beim ersten Attributzugriff dekodiert, Verweise liefern wieder Lazy-Entities.
+# open_lazy(...) ersetzt ifcopenshell.open für die Extraktion: by_type, by_id, is_a, id, Attribute per
+# Name und Index. Inverse Attribute (HasAssociations, IsDefinedBy, ...) gibt es nicht - der Parser
+# liest Beziehungen über die Indizes (PropertyIndex, RelationIndex, TypeIndex) vorwärts.
+# Die Seiten des mmap werden von den Workern (fork) gemeinsam genutzt.
+
+import mmap
+import re
+from array import array
+import ifcopenshell.ifcopenshell_wrapper as wrapper
+from StepFilter import parse_arguments, statements, ENTITY, FILE_SCHEMA
+
+STEP_ESCAPE = re.compile(r"''|\\\\|\\S\\(.)|\\X\\([0-9A-Fa-f]{2})|\\X2\\((?:[0-9A-Fa-f]{4})+)\\X0\\"
+                         r"|\\X4\\((?:[0-9A-Fa-f]{8})+)\\X0\\|\\P.\\")
+
+
+def step_escape(match):
+    text = match.group(0)
+    if text == "''":
+        return "'"
+    elif text == '\\\\':
+        return '\\'
+    elif match.group(1) is not None:
+        return chr(ord(match.group(1)) + 128)
+    elif match.group(2) is not None:
+        return chr(int(match.group(2), 16))
+    elif match.group(3) is not None:
+        return bytes.fromhex(match.group(3)).decode('utf-16-be')
+    elif match.group(4) is not None:
+        return bytes.fromhex(match.group(4)).decode('utf-32-be')
+    return ''  # \P.\ Codepage
+
+
+def decode_string(text):
+    return STEP_ESCAPE.sub(step_escape, text)
+
+
+def is_real(parameter_type):
+    # REAL/NUMBER-Attribute werden wie bei ifcopenshell immer als float geliefert (auch "1200")
+    simple_type = parameter_type.as_simple_type()
+    if simple_type is not None:
+        return simple_type.declared_type() in ('real', 'number')
+    named_type = parameter_type.as_named_type()
+    if named_type is not None:
+        type_declaration = named_type.declared_type().as_type_declaration()
+        return type_declaration is not None and is_real(type_declaration.declared_type())
+    aggregation_type = parameter_type.as_aggregation_type()
+    if aggregation_type is not None:
+        return is_real(aggregation_type.type_of_element())
+    return False
+
+
+class EntityType:
+    # Schema-Informationen einer Klasse, einmal je Modell und Klasse ermittelt
+    __slots__ = ('name', 'ancestors', 'attribute_index', 'real_attributes')
+
+    def __init__(self, declaration):
+        self.name = declaration.name()
+        ancestors = set()
+        supertype = declaration
+        while supertype is not None:
+            ancestors.add(supertype.name().lower())
+            supertype = supertype.supertype()
+        self.ancestors = frozenset(ancestors)
+        attributes = declaration.all_attributes()
+        self.attribute_index = dict((attribute.name(), i) for i, attribute in enumerate(attributes))
+        self.real_attributes = tuple(is_real(attribute.type_of_attribute()) for attribute in attributes)
+
+
+class LazyValue:
+    # typisierter Wert in einem SELECT, z.B. IFCBOOLEAN(.T.) -> wrappedValue True
+    __slots__ = ('type_name', 'wrappedValue')
+
+    def __init__(self, type_name, wrappedValue):
+        self.type_name = type_name
+        self.wrappedValue = wrappedValue
+
+    def is_a(self, name=None):
+        if name is None:
+            return self.type_name
+        return name.lower() == self.type_name.lower()
+
+    def __repr__(self):
+        return '%s(%r)' % (self.type_name, self.wrappedValue)
+
+
+class LazyEntity:
+    __slots__ = ('_model', '_id', '_type', '_values')
+
+    def __init__(self, model, entity_id, entity_type):
+        self._model = model
+        self._id = entity_id
+        self._type = entity_type
+        self._values = None
+
+    def id(self):
+        return self._id
+
+    def is_a(self, name=None):
+        if name is None:
+            return self._type.name
+        return name.lower() in self._type.ancestors
+
+    def values(self):
+        if self._values is None:
+            self._values = self._model.decode(self._id, self._type)
+        return self._values
+
+    def __getattr__(self, name):
+        i = self._type.attribute_index.get(name)
+        if i is None:
+            raise AttributeError("entity instance of type '%s' has no attribute '%s'" % (self._type.name, name))
+        return self.values()[i]
+
+    def __getitem__(self, i):
+        return self.values()[i]
+
+    def __len__(self):
+        return len(self._type.real_attributes)
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def __eq__(self, other):
+        return isinstance(other, LazyEntity) and other._id == self._id and other._model is self._model
+
+    def __hash__(self):
+        return hash(self._id)
+
+    def __repr__(self):
+        return '#%d=%s(...)' % (self._id, self._type.name)
+
+
+class LazyModel:
+    def __init__(self, ifc_filename):
+        self._file = open(ifc_filename, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.schema = FILE_SCHEMA.search(self._mm).group(1).decode('ascii')
+        self._schema = wrapper.schema_by_name(self.schema)
+        self._entity_types = {}
+        self._typed_reals = {}
+        self._offsets = array('Q')
+        self._lengths = array('L')
+        self._ids_by_type = {}
+        self.scan()
+
+    def scan(self):
+        # ein Durchlauf über die Datei: Offset und Länge je #id, ids je Klasse
+        # (Anweisungen wie beim selektiven Laden an ';' außerhalb von Strings, auch mehrere je Zeile)
+        offsets, lengths, ids_by_type = self._offsets, self._lengths, self._ids_by_type
+        for start, statement in statements(self._mm):
+            match = ENTITY.match(statement)
+            if match is None:
+                continue  # Header, DATA;, ENDSEC;
+            entity_id = int(match.group(1))
+            if entity_id >= len(offsets):
+                grow = entity_id + 1 - len(offsets) + 65536
+                offsets.frombytes(bytes(grow * offsets.itemsize))
+                lengths.frombytes(bytes(grow * lengths.itemsize))
+            # Offset ab '#', Länge bis einschließlich ';'
+            hash_mark = match.start(1) - 1
+            offsets[entity_id] = start + hash_mark
+            lengths[entity_id] = len(statement) - hash_mark
+
+            ids = ids_by_type.get(match.group(2))
+            if ids is None:
+                ids = ids_by_type[match.group(2)] = array('L')
+            ids.append(entity_id)
+
+    def entity_type(self, step_name):
+        entity_type = self._entity_types.get(step_name)
+        if entity_type is None:
+            entity_type = EntityType(self._schema.declaration_by_name(step_name.decode('ascii')))
+            self._entity_types[step_name] = entity_type
+        return entity_type
+
+    def by_id(self, entity_id):
+        offset = self._offsets[entity_id] if entity_id < len(self._offsets) else 0
+        if offset == 0:
+            raise RuntimeError('Instance #%d not found' % entity_id)
+        match = ENTITY.match(self._mm, offset)
+        return LazyEntity(self, entity_id, self.entity_type(match.group(2).upper()))
+
+    def by_type(self, type_name, include_subtypes=True):
+        # Reihenfolge wie ifcopenshell: Klasse vor Unterklassen, je Klasse nach id
+        declarations = [self._schema.declaration_by_name(type_name)]
+        while declarations:
+            declaration = declarations.pop(0)
+            step_name = declaration.name().upper().encode('ascii')
+            entity_type = None
+            for ids in (self._ids_by_type.get(step_name), self._ids_by_type.get(declaration.name().encode('ascii'))):
+                if not ids:
+                    continue
+                if entity_type is None:
+                    entity_type = self.entity_type(step_name)
+                for entity_id in ids:
+                    yield LazyEntity(self, entity_id, entity_type)
+            if include_subtypes:
+                declarations[0:0] = declaration.subtypes()
+
+    def decode(self, entity_id, entity_type):
+        offset = self._offsets[entity_id]
+        statement = self._mm[offset:offset + self._lengths[entity_id]]
+        try:
+            s = statement.decode('utf-8')
+        except UnicodeDecodeError:
+            s = statement.decode('latin-1')
+        items = parse_arguments(s, s.index('(') + 1)[0]
+        real_attributes = entity_type.real_attributes
+        return tuple(self.value(item, real_attributes[i] if i < len(real_attributes) else False)
+                     for i, item in enumerate(items))
+
+    def typed_real(self, type_name):
+        real = self._typed_reals.get(type_name)
+        if real is None:
+            type_declaration = self._schema.declaration_by_name(type_name).as_type_declaration()
+            real = type_declaration is not None and is_real(type_declaration.declared_type())
+            self._typed_reals[type_name] = real
+        return real
+
+    def value(self, item, real):
+        text, sublist = item
+        if sublist is not None:
+            if text:
+                type_name = self._schema.declaration_by_name(text).name()
+                return LazyValue(type_name, self.value(sublist[0], self.typed_real(text)) if sublist else None)
+            return tuple(self.value(element, real) for element in sublist)
+
+        first = text[:1]
+        if first == '#':
+            return self.by_id(int(text[1:]))
+        elif first == "'":
+            return decode_string(text[1:-1])
+        elif first == '.':
+            enum = text[1:-1]
+            if enum == 'T':
+                return True
+            elif enum == 'F':
+                return False
+            elif enum == 'U':
+                return 'UNKNOWN'
+            return enum
+        elif first in ('$', '*', ''):
+            return None
+        elif first == '"':
+            return text[1:-1]
+        elif real or '.' in text or 'E' in text or 'e' in text:
+            return float(text)
+        return int(text)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def open_lazy(ifc_filename):
+    return LazyModel(ifc_filename)
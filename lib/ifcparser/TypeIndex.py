@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+# ----- Typ-Index ----- #
+# Zuordnung Element -> Typobjekt (IfcRelDefinesByType), einmalig je Modell eingelesen statt je Element
+# über IsTypedBy (IFC4) bzw. IsDefinedBy / RelatingType (IFC2x3) zu suchen:
+#   element id -> IfcTypeObject
+# Das Typobjekt liefert den PredefinedType, wenn das Element selbst keinen angibt, und seine
+# Property-Sets ergänzen die des Elements (siehe PropertyIndex.build_property_index).
+
+# PredefinedType-Werte, bei denen der Wert des Typobjekts gilt
+UNDEFINED_ENUMS = (None, 'NOTDEFINED')
+
+_types = None
+
+
+def build_type_index(model):
+    global _types
+
+    types = {}
+    for rel in model.by_type("IfcRelDefinesByType"):
+        for element in rel.RelatedObjects:
+            types.setdefault(element.id(), rel.RelatingType)
+
+    _types = types
+    return types
+
+
+def reset_type_index():
+    global _types
+    _types = None
+
+
+def type_of(ifc_element):
+    if _types is not None:
+        return _types.get(ifc_element.id())
+
+    # ohne Index (z.B. KG.py einzeln genutzt): inverse Beziehung direkt abfragen
+    for rel in getattr(ifc_element, 'IsTypedBy', ()):  # IFC4
+        return rel.RelatingType
+    for rel in getattr(ifc_element, 'IsDefinedBy', ()):  # 2x3
+        if rel.is_a('IfcRelDefinesByType'):
+            return rel.RelatingType
+    return None
+
+
+def type_property_sets(type_object):
+    return getattr(type_object, 'HasPropertySets', None) or ()
+
+
+def predefined_type(ifc_element):
+    # Element überschreibt Typ: nur NOTDEFINED bzw. nicht gesetzt wird vom Typobjekt übernommen,
+    # ebenso bei Klassen ohne PredefinedType (IFC2x3, z.B. IfcWallStandardCase mit IfcWallType)
+    enum = getattr(ifc_element, 'PredefinedType', None)
+    if enum in UNDEFINED_ENUMS:
+        type_object = type_of(ifc_element)
+        type_enum = getattr(type_object, 'PredefinedType', None)
+        if type_enum not in UNDEFINED_ENUMS:
+            return type_enum
+    return enum
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# ----- Einheiten ----- #
+# Exportiert wird in SI-Einheiten ohne Präfix (m, m², m³, kg, kg/m³). Die Faktoren der Projekteinheiten
+# (IfcProject.UnitsInContext) werden einmal je Modell bestimmt, danach kostet jeder Wert eine Multiplikation:
+#   IfcSIUnit               Präfix; bei reinen Längeneinheiten hoch Exponent (mm² = 1e-6 m², dm³ = 1e-3 m³),
+#                           GRAM -> kg
+#   IfcConversionBasedUnit  ConversionFactor, auch verkettet (z.B. square foot -> foot -> inch -> m) und auf
+#                           eine IfcDerivedUnit bezogen
+#   IfcDerivedUnit          Produkt der Faktoren hoch Exponent (z.B. Rohdichte in g/cm³)
+# Nicht zugeordnete Einheitentypen gelten als SI. Eine Einheit direkt an der Menge/Property hat Vorrang.
+
+prefixes = {None: 1, 'EXA': 1e18, 'PETA': 1e15, 'TERA': 1e12, 'GIGA': 1e9, 'MEGA':
+    1e6, 'KILO': 1e3, 'HECTO': 1e2, 'DECA': 1e1, 'DECI': 1e-1, 'CENTI':
+                1e-2, 'MILLI': 1e-3, 'MICRO': 1e-6, 'NANO': 1e-9, 'PICO': 1e-12,
+            'FEMTO': 1e-15, 'ATTO': 1e-18}
+
+# SI-Einheiten, deren Präfix mit dem Längenexponenten wirkt
+length_powers = {'METRE': 1, 'SQUARE_METRE': 2, 'CUBIC_METRE': 3}
+
+# SI-Basiseinheit ist kg, nicht g
+base_scales = {'GRAM': 1e-3}
+
+# Einheitentyp (IfcUnitEnum / IfcDerivedUnitEnum) -> Faktor auf SI
+_scales = {}
+# Einheit (Entity-Id) -> Faktor auf SI
+_unit_scales = {}
+
+
+def reset_unit_context():
+    _scales.clear()
+    _unit_scales.clear()
+
+
+def named_unit_scale(unit):
+    scale = 1.0
+    while unit.is_a('IfcConversionBasedUnit'):
+        scale *= unit.ConversionFactor.ValueComponent.wrappedValue
+        unit = unit.ConversionFactor.UnitComponent
+    if unit.is_a('IfcDerivedUnit'):
+        # z.B. pound per cubic foot -> lb/ft³
+        scale *= unit_scale(unit)
+    elif unit.is_a('IfcSIUnit'):
+        name = unit.Name.replace('METER', 'METRE')
+        scale *= prefixes[unit.Prefix] ** length_powers.get(name, 1) * base_scales.get(name, 1.0)
+    return scale
+
+
+def unit_scale(unit):
+    key = unit.id()
+    scale = _unit_scales.get(key)
+    if scale is None:
+        if unit.is_a('IfcDerivedUnit'):
+            scale = 1.0
+            for element in unit.Elements:
+                scale *= named_unit_scale(element.Unit) ** element.Exponent
+        else:
+            scale = named_unit_scale(unit)
+        _unit_scales[key] = scale
+    return scale
+
+
+def build_unit_context(model):
+    reset_unit_context()
+    for project in model.by_type('IfcProject'):
+        if project.UnitsInContext is None:
+            continue
+        for unit in project.UnitsInContext.Units:
+            if unit.is_a('IfcNamedUnit') or unit.is_a('IfcDerivedUnit'):
+                _scales.setdefault(unit.UnitType, unit_scale(unit))
+    return dict(_scales)
+
+
+def unit_context_key():
+    # für den Zustand der inkrementellen Extraktion
+    return ' '.join('%s=%r' % item for item in sorted(_scales.items()))
+
+
+def si_value(value, unit_type, unit=None):
+    # value in SI; unit: Einheit direkt an der Menge/Property, sonst gilt die Projekteinheit
+    if not isinstance(value, (int, float)):
+        return value
+    if unit is not None:
+        return value * unit_scale(unit)
+    return value * _scales.get(unit_type, 1.0)
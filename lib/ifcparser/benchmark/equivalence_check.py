@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Prüft, dass vollständiges, selektives (--selective-load) und Lazy-Laden (--lazy-load) dieselben Dateien
+# liefern (CSV, Massen und Schichten byteweise gleich) - auf synthetischen Modellen (siehe synthetic_model.py)
+# und auf Varianten, die StepFilter und StepReader besonders fordern:
+#   Namen mit \X2\..\X0\, '' und \S\ sowie ';' im String
+#   eine Entity über mehrere Zeilen, mehrere Entities in einer Zeile
+#   IFC2X3: IfcWallStandardCase ohne PredefinedType, Wandtyp ELEMENTEDWALL -> KG 337 / 346
+# Bei Abweichungen endet das Skript mit Exit-Code 1.
+#
+#   python benchmark/equivalence_check.py
+#   python benchmark/equivalence_check.py --elements 1000 --dir /tmp/ifc-check
+import os
+import re
+import sys
+import shutil
+import argparse
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+from synthetic_model import writeSyntheticModel
+from IFC2LCA_elca import parseIfc, massFilename, layersFilename
+
+LOADERS = (('vollständig', {}), ('selektiv', {'selective': True}), ('lazy', {'lazy': True}))
+
+# Ersetzungen der Namen: (synthetisch, Variante)
+NAMES = ((b"'Wand 0'", b"'Wand \\X2\\00E4\\X0\\u\\S\\_0'"),
+         (b"'Decke 2'", b"'Decke ''Nord'' 2'"),
+         (b"'Fenster 3'", b"'Fenster 3; Typ A'"))
+
+
+def writeVariant(source, target, elemented):
+    with open(source, 'rb') as file:
+        text = file.read()
+    for name, replacement in NAMES:
+        text = text.replace(name, replacement, 1)
+    if elemented:
+        text = re.sub(rb"(IFCWALLTYPE\(.*),\.STANDARD\.\);", rb"\1,.ELEMENTEDWALL.);", text)
+
+    header, data = text.split(b'DATA;\n', 1)
+    statements = []
+    for line in data.split(b'\n'):
+        if line.startswith(b'#') and b"'Wand 1'" in line:
+            # eine Entity über mehrere Zeilen
+            line = line.replace(b',', b',\n  ')
+        statements.append(line)
+    # je drei Entities in einer Zeile
+    joined = [b' '.join(statements[i:i + 3]) for i in range(0, len(statements), 3)]
+    with open(target, 'wb') as file:
+        file.write(header + b'DATA;\n' + b'\n'.join(joined))
+
+
+def readOutputs(csv_filename):
+    outputs = []
+    for filename in (csv_filename, massFilename(csv_filename), layersFilename(csv_filename)):
+        with open(filename, 'rb') as file:
+            outputs.append((os.path.basename(filename), file.read()))
+    return outputs
+
+
+def firstDifference(expected, actual):
+    for number, (a, b) in enumerate(zip(expected.splitlines(), actual.splitlines()), 1):
+        if a != b:
+            return 'Zeile %d: %r != %r' % (number, a, b)
+    return 'Zeilenzahl %d != %d' % (len(expected.splitlines()), len(actual.splitlines()))
+
+
+def checkModel(ifc_filename, model_dir):
+    # liefert die Abweichungen gegenüber dem vollständigen Laden und die CSV des vollständigen Ladens
+    results = []
+    for label, options in LOADERS:
+        csv_filename = os.path.join(model_dir, '%s-%s.csv' % (os.path.splitext(os.path.basename(ifc_filename))[0],
+                                                               options and list(options)[0] or 'full'))
+        try:
+            parseIfc(ifc_filename, csv_filename, mass=True, layers=True, **options)
+        except Exception as error:
+            results.append((label, '%s: %s' % (type(error).__name__, error)))
+            continue
+        results.append((label, readOutputs(csv_filename)))
+
+    label, reference = results[0]
+    if isinstance(reference, str):
+        return ['%s: %s' % (label, reference)], ''
+    problems = []
+    for label, outputs in results[1:]:
+        if isinstance(outputs, str):
+            problems.append('%s: %s' % (label, outputs))
+            continue
+        for (_, expected), (name, actual) in zip(reference, outputs):
+            if expected != actual:
+                problems.append('%s, %s: %s' % (label, name, firstDifference(expected, actual)))
+    return problems, reference[0][1].decode('utf-8')
+
+
+def checkElementedWalls(csv_text):
+    # IFC2X3-Variante: alle Wände über den Wandtyp elementiert
+    problems = []
+    for line in csv_text.splitlines()[1:]:
+        columns = line.split(';')
+        if columns[4] == 'IfcWallStandardCase' and columns[1] not in ('337', '346'):
+            problems.append('Wand %s: KG %s statt 337 / 346' % (columns[7], columns[1]))
+    if not any(';IfcWallStandardCase;' in line for line in csv_text.splitlines()):
+        problems.append('keine IfcWallStandardCase exportiert')
+    return problems
+
+
+def checkNames(csv_text):
+    problems = []
+    for expected in ('Wand äuß0', "Decke 'Nord' 2", 'Fenster 3; Typ A'):
+        if expected not in csv_text:
+            problems.append('Name %r fehlt' % expected)
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vollständiges, selektives und Lazy-Laden vergleichen')
+    parser.add_argument('--elements', type=int, default=200)
+    parser.add_argument('--schemas', nargs='+', default=['IFC2X3', 'IFC4'], choices=['IFC2X3', 'IFC4'])
+    parser.add_argument('--dir', default=None, help='Modelle und CSV hier ablegen (Standard: temporär)')
+    args = parser.parse_args()
+
+    model_dir = args.dir or tempfile.mkdtemp(prefix='ifc-check-')
+    os.makedirs(model_dir, exist_ok=True)
+    failed = False
+    try:
+        for schema in args.schemas:
+            ifc_filename = os.path.join(model_dir, 'synthetic-%s-%d.ifc' % (schema, args.elements))
+            writeSyntheticModel(ifc_filename, schema, args.elements)
+            variant_filename = os.path.join(model_dir, 'variant-%s-%d.ifc' % (schema, args.elements))
+            writeVariant(ifc_filename, variant_filename, schema == 'IFC2X3')
+
+            for filename in (ifc_filename, variant_filename):
+                problems, csv_text = checkModel(filename, model_dir)
+                if filename == variant_filename:
+                    problems += checkNames(csv_text)
+                    if schema == 'IFC2X3':
+                        problems += checkElementedWalls(csv_text)
+                print('%-40s %s' % (os.path.basename(filename), 'abweichend' if problems else 'gleich'))
+                for problem in problems:
+                    print('    ' + problem)
+                failed = failed or bool(problems)
+    finally:
+        if not args.dir:
+            shutil.rmtree(model_dir)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Speicherbedarf der extrahierten Produkte:
+#   bisher: Instanz mit __dict__, Entity-Handle bleibt erhalten
+#   jetzt:  eLCA_Produkt mit __slots__, Entity-Handle nach getInfos freigegeben
+#
+#   python benchmark/memory_benchmark.py model.ifc
+import os
+import sys
+import gc
+import types
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import ifcopenshell
+from IFC2LCA_elca import eLCA_Produkt, exportedProducts, prepareModel
+
+
+def dictProdukt(p):
+    # Nachbildung der bisherigen Darstellung
+    P = eLCA_Produkt(p)
+    fields = dict((name, getattr(P, name)) for name in eLCA_Produkt.__slots__)
+    fields['product'] = p
+    return types.SimpleNamespace(**fields)
+
+
+def measure(products, factory):
+    gc.collect()
+    tracemalloc.start()
+    kept = [factory(p) for p in products]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit('Aufruf: memory_benchmark.py model.ifc')
+
+    model = ifcopenshell.open(sys.argv[1])
+    prepareModel(model)
+    products = list(exportedProducts(model))
+
+    before = measure(products, dictProdukt)
+    after = measure(products, eLCA_Produkt)
+
+    print('Elemente:          %d' % len(products))
+    print('__dict__ + Entity: %10d Bytes (%.0f je Element)' % (before, before / max(len(products), 1)))
+    print('__slots__:         %10d Bytes (%.0f je Element)' % (after, after / max(len(products), 1)))
+    print('Reduktion:         %.1f %%' % (100.0 * (before - after) / max(before, 1)))
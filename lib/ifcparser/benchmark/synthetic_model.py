@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Synthetische IFC-Modelle (IFC2X3 / IFC4) beliebiger Größe für Benchmarks:
+#   Wände mit Schichtaufbau (Wandtyp, Pset_WallCommon, Qto_WallBaseQuantities / BaseQuantities),
+#   Decken, Fenster (gemeinsame IfcRepresentationMap), Rohre in Verteilsystemen,
+#   Geschosse, Materialien mit Rohdichte (IFC4: Pset_MaterialCommon)
+# Die Datei wird zeilenweise geschrieben, die GUIDs sind reproduzierbar.
+#
+#   python benchmark/synthetic_model.py IFC4 10000 model.ifc
+import sys
+import uuid
+import ifcopenshell.guid
+
+STOREYS = 3
+SYSTEMS = (('Trinkwasser', 'TW_Trinkwasser', 'DOMESTICCOLDWATER'),
+           ('Heizung', 'H_Vorlauf', 'HEATING'),
+           ('Schmutzwasser', 'S_Schmutzwasser', 'WASTEWATER'),
+           ('Lueftung', 'L_Zuluft', 'VENTILATION'))
+
+
+class StepWriter:
+    def __init__(self, file):
+        self.file = file
+        self.last_id = 0
+        self.guids = 0
+
+    def add(self, entity):
+        self.last_id += 1
+        self.file.write('#%d=%s;\n' % (self.last_id, entity))
+        return '#%d' % self.last_id
+
+    def guid(self):
+        self.guids += 1
+        return "'%s'" % ifcopenshell.guid.compress(uuid.UUID(int=self.guids * 7919 + 12345).hex)
+
+
+def refs(ids):
+    return '(' + ','.join(ids) + ')'
+
+
+def real(value):
+    return repr(float(value))
+
+
+def writeSyntheticModel(filename, schema, elements):
+    ifc4 = schema == 'IFC4'
+    with open(filename, 'w') as file:
+        file.write("ISO-10303-21;\nHEADER;\nFILE_DESCRIPTION(('ViewDefinition [CoordinationView]'),'2;1');\n"
+                   "FILE_NAME('synthetic.ifc','2020-01-01T00:00:00',(''),(''),'synthetic_model.py','','');\n"
+                   "FILE_SCHEMA(('%s'));\nENDSEC;\nDATA;\n" % schema)
+        w = StepWriter(file)
+        add, guid = w.add, w.guid
+
+        organization = add("IFCORGANIZATION($,'IWU',$,$,$)")
+        person = add("IFCPERSONANDORGANIZATION(%s,%s,$)" % (add("IFCPERSON($,'Benchmark',$,$,$,$,$,$)"), organization))
+        application = add("IFCAPPLICATION(%s,'1.0','synthetic','synthetic')" % organization)
+        oh = add("IFCOWNERHISTORY(%s,%s,$,.ADDED.,$,$,$,0)" % (person, application))
+
+        units = [add("IFCSIUNIT(*,.LENGTHUNIT.,.MILLI.,.METRE.)"),
+                 add("IFCSIUNIT(*,.AREAUNIT.,$,.SQUARE_METRE.)"),
+                 add("IFCSIUNIT(*,.VOLUMEUNIT.,$,.CUBIC_METRE.)"),
+                 add("IFCSIUNIT(*,.MASSUNIT.,.KILO.,.GRAM.)")]
+        unit_assignment = add("IFCUNITASSIGNMENT(%s)" % refs(units))
+        origin = add("IFCCARTESIANPOINT((0.,0.,0.))")
+        axis = add("IFCAXIS2PLACEMENT3D(%s,$,$)" % origin)
+        context = add("IFCGEOMETRICREPRESENTATIONCONTEXT($,'Model',3,1.E-05,%s,$)" % axis)
+        project = add("IFCPROJECT(%s,%s,'Benchmark',$,$,$,$,(%s),%s)" % (guid(), oh, context, unit_assignment))
+        placement = add("IFCLOCALPLACEMENT($,%s)" % axis)
+        site = add("IFCSITE(%s,%s,'Grundstueck',$,$,%s,$,$,.ELEMENT.,$,$,$,$,$)" % (guid(), oh, placement))
+        building = add("IFCBUILDING(%s,%s,'Gebaeude',$,$,%s,$,$,.ELEMENT.,$,$,$)" % (guid(), oh, placement))
+        storeys = [add("IFCBUILDINGSTOREY(%s,%s,'Geschoss %d',$,$,%s,$,$,.ELEMENT.,%s)"
+                       % (guid(), oh, i, placement, real(i * 3000))) for i in range(STOREYS)]
+        add("IFCRELAGGREGATES(%s,%s,$,$,%s,(%s))" % (guid(), oh, project, site))
+        add("IFCRELAGGREGATES(%s,%s,$,$,%s,(%s))" % (guid(), oh, site, building))
+        add("IFCRELAGGREGATES(%s,%s,$,$,%s,%s)" % (guid(), oh, building, refs(storeys)))
+
+        def material(name, density):
+            m = add("IFCMATERIAL('%s'%s)" % (name, ",$,$" if ifc4 else ""))
+            if ifc4:
+                value = add("IFCPROPERTYSINGLEVALUE('MassDensity',$,IFCMASSDENSITYMEASURE(%s),$)" % real(density))
+                add("IFCMATERIALPROPERTIES('Pset_MaterialCommon',$,(%s),%s)" % (value, m))
+            return m
+
+        def layer(m, thickness):
+            return add("IFCMATERIALLAYER(%s,%s,$%s)" % (m, real(thickness), ",$,$,$,$" if ifc4 else ""))
+
+        def layer_set_usage(name, layers):
+            layer_set = add("IFCMATERIALLAYERSET(%s,'%s'%s)" % (refs(layers), name, ",$" if ifc4 else ""))
+            return add("IFCMATERIALLAYERSETUSAGE(%s,.AXIS2.,.POSITIVE.,0.%s)" % (layer_set, ",$" if ifc4 else ""))
+
+        concrete = material('Beton', 2400)
+        insulation = material('Daemmung', 30)
+        steel = material('Stahl', 7850)
+        glass = material('Glas', 2500)
+        external_usage = layer_set_usage('AW', [layer(concrete, 200), layer(insulation, 120)])
+        internal_usage = layer_set_usage('IW', [layer(concrete, 115)])
+
+        def solid(x, y, z):
+            position = add("IFCAXIS2PLACEMENT2D(%s,$)" % add("IFCCARTESIANPOINT((0.,0.))"))
+            profile = add("IFCRECTANGLEPROFILEDEF(.AREA.,$,%s,%s,%s)" % (position, real(x), real(y)))
+            return add("IFCEXTRUDEDAREASOLID(%s,%s,%s,%s)"
+                       % (profile, axis, add("IFCDIRECTION((0.,0.,1.))"), real(z)))
+
+        def shape(items, kind='SweptSolid'):
+            representation = add("IFCSHAPEREPRESENTATION(%s,'Body','%s',%s)" % (context, kind, refs(items)))
+            return add("IFCPRODUCTDEFINITIONSHAPE($,$,(%s))" % representation)
+
+        def property_set(element, name, values):
+            properties = []
+            for key, value in values:
+                if isinstance(value, bool):
+                    value = "IFCBOOLEAN(.%s.)" % ('T' if value else 'F')
+                else:
+                    value = "IFCIDENTIFIER('%s')" % value
+                properties.append(add("IFCPROPERTYSINGLEVALUE('%s',$,%s,$)" % (key, value)))
+            pset = add("IFCPROPERTYSET(%s,%s,'%s',$,%s)" % (guid(), oh, name, refs(properties)))
+            add("IFCRELDEFINESBYPROPERTIES(%s,%s,$,$,(%s),%s)" % (guid(), oh, element, pset))
+
+        def quantity_set(element, name, values):
+            quantities = []
+            for key, value in values:
+                kind = 'AREA' if 'Area' in key else 'VOLUME'
+                quantities.append(add("IFCQUANTITY%s('%s',$,$,%s%s)" % (kind, key, real(value), ",$" if ifc4 else "")))
+            qset = add("IFCELEMENTQUANTITY(%s,%s,'%s',$,$,%s)" % (guid(), oh, name, refs(quantities)))
+            add("IFCRELDEFINESBYPROPERTIES(%s,%s,$,$,(%s),%s)" % (guid(), oh, element, qset))
+
+        window_map = add("IFCREPRESENTATIONMAP(%s,%s)" % (axis, add("IFCSHAPEREPRESENTATION(%s,'Body','SweptSolid',(%s))"
+                                                                     % (context, solid(1000, 100, 1200)))))
+        wall_type = add("IFCWALLTYPE(%s,%s,'Wandtyp',$,$,$,$,$,$,.STANDARD.)" % (guid(), oh))
+        if ifc4:
+            loadbearing = add("IFCPROPERTYSINGLEVALUE('LoadBearing',$,IFCBOOLEAN(.T.),$)")
+            type_pset = add("IFCPROPERTYSET(%s,%s,'Pset_WallCommon',$,(%s))" % (guid(), oh, loadbearing))
+            add("IFCRELDEFINESBYPROPERTIES(%s,%s,$,$,(%s),%s)" % (guid(), oh, wall_type, type_pset))
+
+        if ifc4:
+            systems = [add("IFCDISTRIBUTIONSYSTEM(%s,%s,'%s',$,'%s',$,.%s.)" % (guid(), oh, name, reference, enum))
+                       for name, reference, enum in SYSTEMS]
+        else:
+            systems = [add("IFCSYSTEM(%s,%s,'%s',$,'%s')" % (guid(), oh, name, reference))
+                       for name, reference, enum in SYSTEMS]
+
+        contained = dict((storey, []) for storey in storeys)
+        associated = {}
+        typed = []
+        assigned = dict((system, []) for system in systems)
+
+        for i in range(elements):
+            local = add("IFCLOCALPLACEMENT(%s,%s)" % (placement, add("IFCAXIS2PLACEMENT3D(%s,$,$)" % add(
+                "IFCCARTESIANPOINT((%s,0.,0.))" % real(i * 2000)))))
+            kind = i % 5
+            if kind in (0, 1):
+                external = kind == 0
+                e = add("IFCWALL%s(%s,%s,'Wand %d',$,$,%s,%s,$%s)"
+                        % ("" if ifc4 else "STANDARDCASE", guid(), oh, i, local, shape([solid(4000, 320, 3000)]),
+                           ",.STANDARD." if ifc4 else ""))
+                typed.append(e)
+                associated.setdefault(external_usage if external else internal_usage, []).append(e)
+                property_set(e, 'Pset_WallCommon', (('IsExternal', external), ('LoadBearing', True),
+                                                    ('ExtendToStructure', False), ('Reference', 'AW' if external else 'IW')))
+                quantity_set(e, 'Qto_WallBaseQuantities' if ifc4 else 'BaseQuantities',
+                             (('NetSideArea', 12.0), ('GrossVolume', 12.0 * (0.32 if external else 0.115))))
+            elif kind == 2:
+                e = add("IFCSLAB(%s,%s,'Decke %d',$,$,%s,%s,$,.FLOOR.)"
+                        % (guid(), oh, i, local, shape([solid(5000, 5000, 250)])))
+                associated.setdefault(concrete, []).append(e)
+                property_set(e, 'Pset_SlabCommon', (('IsExternal', False), ('LoadBearing', True)))
+                quantity_set(e, 'Qto_SlabBaseQuantities' if ifc4 else 'BaseQuantities',
+                             (('GrossArea', 25.0), ('GrossVolume', 6.25)))
+            elif kind == 3:
+                item = add("IFCMAPPEDITEM(%s,%s)" % (window_map, add(
+                    "IFCCARTESIANTRANSFORMATIONOPERATOR3D($,$,%s,$,$)" % origin)))
+                e = add("IFCWINDOW(%s,%s,'Fenster %d',$,$,%s,%s,$,1200.,1000.%s)"
+                        % (guid(), oh, i, local, shape([item], 'MappedRepresentation'), ",.WINDOW.,$,$" if ifc4 else ""))
+                associated.setdefault(glass, []).append(e)
+                property_set(e, 'Pset_WindowCommon', (('IsExternal', True),))
+            else:
+                e = add("IFC%s(%s,%s,'Rohr %d',$,$,%s,%s,$%s)"
+                        % ("PIPESEGMENT" if ifc4 else "FLOWSEGMENT", guid(), oh, i, local,
+                           shape([solid(50, 50, 3000)]), ",.RIGIDSEGMENT." if ifc4 else ""))
+                associated.setdefault(steel, []).append(e)
+                assigned[systems[(i // 5) % len(systems)]].append(e)
+            contained[storeys[i % STOREYS]].append(e)
+
+        for storey, es in contained.items():
+            if es:
+                add("IFCRELCONTAINEDINSPATIALSTRUCTURE(%s,%s,$,$,%s,%s)" % (guid(), oh, refs(es), storey))
+        for m, es in associated.items():
+            add("IFCRELASSOCIATESMATERIAL(%s,%s,$,$,%s,%s)" % (guid(), oh, refs(es), m))
+        if typed:
+            add("IFCRELDEFINESBYTYPE(%s,%s,$,$,%s,%s)" % (guid(), oh, refs(typed), wall_type))
+        for system, es in assigned.items():
+            if es:
+                add("IFCRELASSIGNSTOGROUP(%s,%s,$,$,%s,$,%s)" % (guid(), oh, refs(es), system))
+
+        file.write("ENDSEC;\nEND-ISO-10303-21;\n")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] not in ('IFC2X3', 'IFC4'):
+        sys.exit('Aufruf: synthetic_model.py IFC2X3|IFC4 Elemente model.ifc')
+    writeSyntheticModel(sys.argv[3], sys.argv[1], int(sys.argv[2]))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Durchsatz des Parsers auf synthetischen Modellen (siehe synthetic_model.py):
+#   Elemente/s, maximaler Speicher (RSS) und Laufzeit je Schritt / Stufe von getInfos
+# Jede Messung läuft in einem eigenen Prozess, damit RSS und Caches unabhängig bleiben.
+#
+#   python benchmark/throughput_benchmark.py                          1k/10k/100k, IFC2X3 und IFC4
+#   python benchmark/throughput_benchmark.py --sizes 1000 --schemas IFC4 --lazy-load --workers 2
+#   python benchmark/throughput_benchmark.py --dir /tmp/ifc-bench --json ergebnis.json
+import os
+import sys
+import json
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+from synthetic_model import writeSyntheticModel
+
+STAGES = ('STOREY', 'area', 'material', 'Distribution System', 'PredefinedType', 'KG', 'KG Name', 'Volume',
+          'Primary Mass', 'Layer Thickness')
+
+
+def runParser(ifc_filename, workers, selective, lazy):
+    # im Messprozess: parsen mit Messwerten, Ergebnis als JSON-Zeile auf stdout
+    from IFC2LCA_elca import parseIfc, statsFilename
+
+    csv_filename = os.path.splitext(ifc_filename)[0] + '.csv'
+    parseIfc(ifc_filename, csv_filename, workers, selective=selective, lazy=lazy, stats=True)
+    with open(statsFilename(csv_filename), encoding='utf-8') as file:
+        report = json.load(file)
+    # ru_maxrss: Linux KiB
+    report['peak_rss_mb'] = round(max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024.0, 1)
+    print(json.dumps(report))
+
+
+def measure(ifc_filename, args):
+    command = [sys.executable, os.path.abspath(__file__), '--run', ifc_filename, '--workers', str(args.workers)]
+    if args.selective_load:
+        command.append('--selective-load')
+    if args.lazy_load:
+        command.append('--lazy-load')
+    output = subprocess.check_output(command)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def printResult(schema, size, report):
+    print('%-7s %8d Elemente  %8.2f s  %9.1f Elemente/s  %8.1f MB RSS' % (
+        schema, size, report['seconds'], report['elements_per_second'] or 0, report['peak_rss_mb']))
+    print('        Schritte: ' + '  '.join('%s %.3f s' % item for item in report['model'].items()))
+    stages = report['stages']
+    print('        Stufen:   ' + '  '.join('%s %.3f s' % (stage, stages[stage]['seconds'])
+                                           for stage in STAGES if stage in stages))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark IFC2LCA_elca.py mit synthetischen Modellen')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--schemas', nargs='+', default=['IFC2X3', 'IFC4'], choices=['IFC2X3', 'IFC4'])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--selective-load', action='store_true')
+    parser.add_argument('--lazy-load', action='store_true')
+    parser.add_argument('--dir', default=None,
+                        help='Modelle hier ablegen und wiederverwenden (Standard: temporär)')
+    parser.add_argument('--json', default=None, help='Ergebnisse zusätzlich als JSON speichern')
+    parser.add_argument('--run', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        runParser(args.run, args.workers, args.selective_load, args.lazy_load)
+        sys.exit()
+
+    model_dir = args.dir or tempfile.mkdtemp(prefix='ifc-bench-')
+    os.makedirs(model_dir, exist_ok=True)
+    results = []
+    try:
+        for schema in args.schemas:
+            for size in args.sizes:
+                ifc_filename = os.path.join(model_dir, 'synthetic-%s-%d.ifc' % (schema, size))
+                if not os.path.exists(ifc_filename):
+                    writeSyntheticModel(ifc_filename, schema, size)
+                report = measure(ifc_filename, args)
+                printResult(schema, size, report)
+                results.append(dict(report, schema=schema, size=size, file_mb=round(
+                    os.path.getsize(ifc_filename) / 1024.0 / 1024.0, 1)))
+    finally:
+        if not args.dir:
+            shutil.rmtree(model_dir)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=1, ensure_ascii=False)